@@ -1,76 +1,49 @@
 import pygame
 import sys
-import random
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialisation de pygame
-pygame.init()
+from blokus_core import BLUE, RED, COLORS, GRID_SIZE, PIECES, BlokusState
+from blokus_ai import AI_TIME_BUDGET, MCTSPlayer
+import text_cache
+from frame_profiler import FrameProfiler
 
 # Définition des couleurs
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
-BLUE = (0, 0, 255)
-RED = (255, 0, 0)
 GRAY = (200, 200, 200)
 
 # Définition des dimensions
 CELL_SIZE = 30
-GRID_SIZE = 12
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 700  # Augmenter la hauteur pour inclure les boutons
 
-# Définition des formes de pièces
-PIECES = {
-    'blue': [
-        [(0, 0)], [(0, 0), (1, 0)], [(0, 0), (1, 0), (2, 0)], [(0, 0), (1, 0), (2, 0), (0, 1)], [(0, 0), (1, 0), (1, 1)],
-        [(0, 0), (1, 0), (2, 0), (3, 0)], [(0, 0), (0, 1)], [(0, 0), (1, 0), (2, 0), (2, 1)], [(0, 0), (1, 0), (0, 1), (1, 1)],
-        [(0, 0), (1, 0), (1, 1), (2, 1)], [(0, 0), (1, 0), (1, 1), (2, 0)]
-    ],
-    'red': [
-        [(0, 0)], [(0, 0), (1, 0)], [(0, 0), (1, 0), (2, 0)], [(0, 0), (1, 0), (2, 0), (0, 1)], [(0, 0), (1, 0), (1, 1)],
-        [(0, 0), (1, 0), (2, 0), (3, 0)], [(0, 0), (0, 1)], [(0, 0), (1, 0), (2, 0), (2, 1)], [(0, 0), (1, 0), (0, 1), (1, 1)],
-        [(0, 0), (1, 0), (1, 1), (2, 1)], [(0, 0), (1, 0), (1, 1), (2, 0)]
-    ]
-}
-
-# Classe pour gérer le plateau de jeu
-class Board:
-    def __init__(self):
-        self.grid = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-
-    def draw(self, surface):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                rect = pygame.Rect(x * CELL_SIZE + 200, y * CELL_SIZE + 100, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(surface, WHITE, rect)
-                pygame.draw.rect(surface, BLACK, rect, 1)
-
-    def place_piece(self, piece, color, x, y):
-        for cell in piece:
-            cx, cy = cell
-            self.grid[cy + y][cx + x] = color
-
-    def is_valid_position(self, piece, x, y):
-        for cell in piece:
-            cx, cy = cell
-            if not (0 <= cx + x < GRID_SIZE and 0 <= cy + y < GRID_SIZE):
-                return False
-            if self.grid[cy + y][cx + x] is not None:
-                return False
-        return True
+# Textes des scores : (joueur, libellé, position)
+SCORE_LABELS = (('blue', "Player 1", (50, 20)), ('red', "Player 2", (SCREEN_WIDTH - 250, 20)))
 
 # Classe pour gérer le jeu Blokus
-class BlokusGame:
-    def __init__(self, screen, ai_enabled=False):
+class BlokusGame(BlokusState):
+    def __init__(self, screen, ai_enabled=False, size=GRID_SIZE):
+        super().__init__(size)
         self.screen = screen
-        self.board = Board()
-        self.turn = 'blue'
         self.selected_piece = None
         self.selected_pos = None
         self.piece_dragging = False
         self.piece_rects = {'blue': [], 'red': []}
         self.create_piece_rects()
-        self.scores = {'blue': 0, 'red': 0}
+        self.play_ai_button = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 80, 200, 50)
+        self.quit_button = pygame.Rect(SCREEN_WIDTH // 2 + 100, SCREEN_HEIGHT - 80, 100, 50)
         self.ai_enabled = ai_enabled
+        # Rendu par zones modifiées : fond statique mis en cache, puis seules les cases et
+        # les scores qui ont changé depuis l'image précédente sont redessinés
+        self.background = None
+        self.drawn_masks = {}
+        self.drawn_scores = {}
+        self.score_rects = {}
+        # L'IA réfléchit dans un thread (qui répartit la recherche sur plusieurs processus)
+        # pour que la boucle pygame continue de tourner pendant ce temps
+        self.ai_player = MCTSPlayer(AI_TIME_BUDGET)
+        self.ai_executor = None
+        self.ai_future = None
 
     def create_piece_rects(self):
         for color in PIECES:
@@ -78,52 +51,93 @@ class BlokusGame:
                 rect = pygame.Rect(30 if color == 'blue' else SCREEN_WIDTH - 100, 50 + i * 40, 100, 30)
                 self.piece_rects[color].append((rect, piece))
 
+    def build_layers(self):
+        # Plateau vide, pièces des réserves et boutons : dessinés une seule fois
+        self.background = pygame.Surface(self.screen.get_size())
+        self.background.fill(BLACK)
+        self.draw_board(self.background)
+        self.draw_pieces(self.background)
+        self.draw_buttons(self.background)
+        self.drawn_masks = {color: 0 for color in self.board.masks}
+        self.drawn_scores = {}
+        self.score_rects = {}
+
     def draw(self):
-        self.screen.fill(BLACK)
-        self.board.draw(self.screen)
-        self.draw_pieces()
-        self.draw_scores()
-        self.draw_buttons()
+        # Renvoie la liste des rectangles modifiés, à passer à pygame.display.update
+        dirty = []
+        if self.background is None:
+            self.build_layers()
+            self.screen.blit(self.background, (0, 0))
+            dirty.append(self.screen.get_rect())
+        dirty += self.draw_cells()
+        dirty += self.draw_scores()
+        return dirty
+
+    def draw_board(self, surface):
+        for y in range(self.board.size):
+            for x in range(self.board.size):
+                rect = pygame.Rect(x * CELL_SIZE + 200, y * CELL_SIZE + 100, CELL_SIZE, CELL_SIZE)
+                pygame.draw.rect(surface, WHITE, rect)
+                pygame.draw.rect(surface, BLACK, rect, 1)
 
-    def draw_pieces(self):
+    def draw_pieces(self, surface):
         for color in self.piece_rects:
             for rect, piece in self.piece_rects[color]:
                 for cell in piece:
                     cx, cy = cell
                     cell_rect = pygame.Rect(rect.x + cx * 20, rect.y + cy * 20, 20, 20)
-                    pygame.draw.rect(self.screen, BLUE if color == 'blue' else RED, cell_rect)
-
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                color = self.board.grid[y][x]
-                if color is not None:
-                    rect = pygame.Rect(x * CELL_SIZE + 200, y * CELL_SIZE + 100, CELL_SIZE, CELL_SIZE)
-                    pygame.draw.rect(self.screen, color, rect)
+                    pygame.draw.rect(surface, BLUE if color == 'blue' else RED, cell_rect)
+
+    def draw_cells(self):
+        # Cases dont la couleur a changé depuis la dernière image (pose ou retrait de pièce)
+        changed = 0
+        for color, mask in self.board.masks.items():
+            changed |= mask ^ self.drawn_masks.get(color, 0)
+        self.drawn_masks = dict(self.board.masks)
+        rects = []
+        while changed:
+            low = changed & -changed
+            index = low.bit_length() - 1
+            x, y = index % self.board.size, index // self.board.size
+            rect = pygame.Rect(x * CELL_SIZE + 200, y * CELL_SIZE + 100, CELL_SIZE, CELL_SIZE)
+            self.screen.blit(self.background, rect, rect)
+            color = self.board.color_at(x, y)
+            if color is not None:
+                pygame.draw.rect(self.screen, color, rect)
+            rects.append(rect)
+            changed ^= low
+        return rects
 
     def draw_scores(self):
-        font = pygame.font.Font(None, 36)
-        blue_score_text = font.render(f"Player 1 Score: {self.scores['blue']}", True, BLUE)
-        red_score_text = font.render(f"Player 2 Score: {self.scores['red']}", True, RED)
-        self.screen.blit(blue_score_text, (50, 20))
-        self.screen.blit(red_score_text, (SCREEN_WIDTH - 250, 20))
-
-    def draw_buttons(self):
-        font = pygame.font.Font(None, 36)
-        self.play_ai_button = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 80, 200, 50)
-        self.quit_button = pygame.Rect(SCREEN_WIDTH // 2 + 100, SCREEN_HEIGHT - 80, 100, 50)
-
-        pygame.draw.rect(self.screen, GRAY, self.play_ai_button)
-        pygame.draw.rect(self.screen, GRAY, self.quit_button)
-
-        play_ai_text = font.render("Jouer contre IA", True, BLACK)
-        quit_text = font.render("Quitter", True, BLACK)
-
-        self.screen.blit(play_ai_text, (self.play_ai_button.x + 10, self.play_ai_button.y + 10))
-        self.screen.blit(quit_text, (self.quit_button.x + 10, self.quit_button.y + 10))
+        rects = []
+        for name, label, pos in SCORE_LABELS:
+            if self.drawn_scores.get(name) == self.scores[name]:
+                continue
+            self.drawn_scores[name] = self.scores[name]
+            old_rect = self.score_rects.get(name)
+            if old_rect is not None:
+                self.screen.blit(self.background, old_rect, old_rect)
+            text = text_cache.render(f"{label} Score: {self.scores[name]}", COLORS[name])
+            rect = self.screen.blit(text, pos)
+            self.score_rects[name] = rect
+            rects.append(rect if old_rect is None else rect.union(old_rect))
+        return rects
+
+    def draw_buttons(self, surface):
+        pygame.draw.rect(surface, GRAY, self.play_ai_button)
+        pygame.draw.rect(surface, GRAY, self.quit_button)
+
+        play_ai_text = text_cache.render("Jouer contre IA", BLACK)
+        quit_text = text_cache.render("Quitter", BLACK)
+
+        surface.blit(play_ai_text, (self.play_ai_button.x + 10, self.play_ai_button.y + 10))
+        surface.blit(quit_text, (self.quit_button.x + 10, self.quit_button.y + 10))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            for rect, piece in self.piece_rects[self.turn]:
+            # Pas de sélection de pièce pendant que l'IA réfléchit
+            pieces = self.piece_rects[self.turn] if self.ai_future is None else []
+            for rect, piece in pieces:
                 if rect.collidepoint(event.pos):
                     self.selected_piece = piece
                     self.selected_pos = (event.pos[0] // CELL_SIZE, event.pos[1] // CELL_SIZE)
@@ -133,14 +147,12 @@ class BlokusGame:
             if self.play_ai_button.collidepoint(event.pos):
                 self.ai_enabled = True
             if self.quit_button.collidepoint(event.pos):
-                pygame.quit()
-                sys.exit()
+                # Même sortie que la fermeture de la fenêtre (export du profil, arrêt de l'IA)
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
 
         elif event.type == pygame.MOUSEBUTTONUP and self.piece_dragging:
             x, y = self.selected_pos
-            if self.board.is_valid_position(self.selected_piece, x - 6, y - 3):
-                self.board.place_piece(self.selected_piece, BLUE if self.turn == 'blue' else RED, x - 6, y - 3)
-                self.update_score()
+            if self.place(self.selected_piece, x - 6, y - 3):
                 self.next_turn()
             self.selected_piece = None
             self.piece_dragging = False
@@ -148,65 +160,80 @@ class BlokusGame:
         elif event.type == pygame.MOUSEMOTION and self.piece_dragging:
             self.selected_pos = (event.pos[0] // CELL_SIZE, event.pos[1] // CELL_SIZE)
 
-    def update_score(self):
-        self.scores['blue'] = sum(row.count(BLUE) for row in self.board.grid)
-        self.scores['red'] = sum(row.count(RED) for row in self.board.grid)
-
     def next_turn(self):
-        self.turn = 'red' if self.turn == 'blue' else 'blue'
+        super().next_turn()
         if self.turn == 'red' and self.ai_enabled:
             self.ai_move()
 
     def ai_move(self):
-        valid_moves = []
-        for piece in PIECES['red']:
-            for x in range(GRID_SIZE):
-                for y in range(GRID_SIZE):
-                    if self.board.is_valid_position(piece, x, y):
-                        valid_moves.append((piece, x, y))
-        if valid_moves:
-            piece, x, y = random.choice(valid_moves)
-            self.board.place_piece(piece, RED, x, y)
-            self.update_score()
-            self.next_turn()
-
-    def is_game_over(self):
-        return not any(self.board.is_valid_position(piece, x, y)
-                       for piece in PIECES[self.turn]
-                       for x in range(GRID_SIZE)
-                       for y in range(GRID_SIZE))
-
-    def declare_winner(self):
-        if self.scores['blue'] > self.scores['red']:
-            return "Blue wins!"
-        elif self.scores['red'] > self.scores['blue']:
-            return "Red wins!"
-        else:
-            return "It's a tie!"
-
-def main():
+        if self.ai_future is None and self.board.moves(RED):
+            if self.ai_executor is None:
+                self.ai_executor = ThreadPoolExecutor(max_workers=1)
+            # L'IA travaille sur une copie de l'état, indépendante de l'affichage
+            state = BlokusState.from_snapshot(self.snapshot())
+            self.ai_future = self.ai_executor.submit(self.ai_player.choose_move, state)
+
+    def update(self):
+        # Applique le coup de l'IA dès que la recherche est terminée
+        if self.ai_future is not None and self.ai_future.done():
+            pid = self.ai_future.result()
+            self.ai_future = None
+            stats = self.ai_player.last_stats
+            print(f"IA : {stats['playouts']} simulations en {stats['seconds']:.2f} s "
+                  f"({stats['playouts_per_sec']:.0f} simulations/s)")
+            if pid is not None:
+                self.board.make_move(RED, pid)
+                self.update_score()
+                self.next_turn()
+
+    def close(self):
+        # Arrête le thread et les processus de recherche de l'IA
+        if self.ai_executor is not None:
+            self.ai_executor.shutdown(wait=False, cancel_futures=True)
+        self.ai_player.close()
+
+def main(profile=None):
+    # Initialisation de pygame
+    pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Blokus")
 
     game = BlokusGame(screen)
     clock = pygame.time.Clock()
+    # Temps par phase (F3 affiche le panneau) ; export JSON/CSV à la fermeture si demandé
+    profiler = FrameProfiler(('input', 'update', 'ai', 'draw'))
+
+    def quit_game():
+        game.close()
+        if profile:
+            profiler.export(profile)
+        pygame.quit()
+        sys.exit()
 
+    profiler.begin_frame()
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            game.handle_event(event)
-
-        if game.is_game_over():
-            winner = game.declare_winner()
-            print(winner)
-            pygame.quit()
-            sys.exit()
-
-        game.draw()
-        pygame.display.flip()
+        with profiler.phase('input'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    quit_game()
+                profiler.handle_event(event)
+                game.handle_event(event)
+
+        with profiler.phase('ai'):
+            game.update()
+        with profiler.phase('update'):
+            if game.is_game_over():
+                winner = game.declare_winner()
+                print(winner)
+                quit_game()
+
+        with profiler.phase('draw'):
+            dirty = game.draw()
+            dirty += profiler.draw(screen, (10, SCREEN_HEIGHT - 150), game.background)
+            pygame.display.update(dirty)
         clock.tick(30)
+        profiler.end_frame()
 
 if __name__ == "__main__":
-    main()
+    profile = sys.argv[1] if len(sys.argv) > 1 else None  # Fichier d'export des temps par image
+    main(profile)
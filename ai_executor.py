@@ -0,0 +1,99 @@
+# Background AI worker for tkinter games (no engine import)
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 20  # How often the Tk loop checks for finished searches
+
+
+class AIExecutor:
+    """Runs AI searches on a background thread and hands the results back to Tk.
+
+    Work is queued on a single worker thread, so one engine (and its memo
+    table) is never searched by two tasks at once. Every task receives a
+    `stop` threading.Event; cancel() sets the events of all outstanding tasks
+    and drops their results. Finished results travel through a queue that
+    the Tk loop polls with `after`, so callbacks always run on the main
+    thread, and not before `min_delay` seconds after submission. If a task
+    raises, its traceback is printed and the exception goes to `errback`
+    instead, so a failed search never leaves the caller waiting.
+    """
+
+    def __init__(self, master, poll_ms=POLL_MS):
+        """Bind to the Tk widget whose `after` drives the polling."""
+        self.master = master
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.results = queue.Queue()
+        self.active = set()  # Stop events of tasks not yet delivered or cancelled
+        self.waiting = 0  # Results still expected by the polling loop
+
+    def submit(self, fn, *args, callback=None, errback=None, min_delay=0.0):
+        """Run fn(*args, stop=event) in the background and pass its result to `callback`.
+
+        Tasks without a callback (e.g. pondering) run for their side effects only.
+        If fn raises, `errback` (when given) receives the exception on the Tk thread.
+        Returns the task's stop event.
+        """
+        stop = threading.Event()
+        self.active.add(stop)
+        ready_at = time.monotonic() + min_delay
+
+        def run():
+            result = error = None
+            try:
+                if not stop.is_set():
+                    result = fn(*args, stop=stop)
+            except Exception as e:
+                traceback.print_exc()
+                error = e
+            finally:
+                # Always queued, so the polling loop stops once every expected result is in
+                if callback is not None:
+                    self.results.put((stop, callback, errback, result, error, ready_at))
+
+        self.pool.submit(run)
+        if callback is not None:
+            self.waiting += 1
+            if self.waiting == 1:
+                self.master.after(self.poll_ms, self.poll)
+        return stop
+
+    def cancel(self):
+        """Stop every outstanding task; their callbacks will not be called."""
+        for stop in self.active:
+            stop.set()
+        self.active.clear()
+
+    def poll(self):
+        """Deliver finished results on the Tk thread; reschedules itself while results are due."""
+        while True:
+            try:
+                stop, callback, errback, result, error, ready_at = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.waiting -= 1
+            delay = ready_at - time.monotonic()
+            if delay > 0:
+                self.master.after(int(delay * 1000), self.deliver, stop, callback, errback, result, error)
+            else:
+                self.deliver(stop, callback, errback, result, error)
+        if self.waiting:
+            self.master.after(self.poll_ms, self.poll)
+
+    def deliver(self, stop, callback, errback, result, error=None):
+        """Call the callback (or errback on failure) unless the task was cancelled in the meantime."""
+        if stop.is_set() or stop not in self.active:
+            return
+        self.active.discard(stop)
+        if error is None:
+            callback(result)
+        elif errback is not None:
+            errback(error)
+
+    def shutdown(self):
+        """Cancel everything and let the worker thread finish."""
+        self.cancel()
+        self.pool.shutdown(wait=False)
@@ -0,0 +1,228 @@
+# Transcription audio par morceaux, en parallèle et sans fichier intermédiaire.
+# L'audio est décodé en flux PCM (ffmpeg, ou le module wave pour les .wav 16 bits), découpé sur
+# les silences en morceaux de durée bornée, puis chaque morceau est transcrit par un
+# moteur interchangeable dans un groupe de threads. Seuls quelques morceaux sont en
+# mémoire à la fois, quelle que soit la durée de l'enregistrement.
+import subprocess
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+SAMPLE_RATE = 16000  # Hz, mono, 16 bits : suffisant pour la reconnaissance vocale
+FRAME_MS = 30  # Durée d'une trame pour la détection de silence
+SILENCE_DB = -40.0  # Niveau (dBFS) sous lequel une trame est silencieuse
+MIN_SILENCE_MS = 400  # Silence minimal pour couper
+MIN_CHUNK = 5.0  # Secondes : pas de coupe avant
+MAX_CHUNK = 30.0  # Secondes : coupe forcée au-delà
+WORKERS = 4
+
+class Chunk:
+    def __init__(self, index, start, pcm, sample_rate):
+        self.index = index
+        self.start = start  # Secondes depuis le début de l'enregistrement
+        self.pcm = pcm  # Octets PCM 16 bits mono
+        self.sample_rate = sample_rate
+
+    @property
+    def end(self):
+        return self.start + len(self.pcm) / (2 * self.sample_rate)
+
+class Segment:
+    def __init__(self, start, end, text, error=None):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.error = error
+
+    def __repr__(self):
+        text = f"<erreur : {self.error}>" if self.error else self.text
+        return f"[{format_timestamp(self.start)} - {format_timestamp(self.end)}] {text}"
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+# -------------------- Décodage --------------------
+
+def pcm_stream(path, sample_rate=SAMPLE_RATE, block_bytes=1 << 16):
+    # Renvoie (taux d'échantillonnage, générateur de blocs d'octets PCM 16 bits mono), toujours
+    # au taux demandé : ffmpeg rééchantillonne tout ce que la voie rapide .wav ne sait pas lire
+    if path.lower().endswith('.wav'):
+        blocks = _wav_blocks(path, sample_rate, block_bytes)
+        if blocks is not None:
+            return sample_rate, blocks
+    return sample_rate, _ffmpeg_blocks(path, sample_rate, block_bytes)
+
+def _wav_blocks(path, sample_rate, block_bytes):
+    # Voie rapide sans ffmpeg pour les .wav PCM 16 bits déjà au bon taux (plusieurs canaux
+    # sont moyennés en mono). None pour les autres (8, 24 ou 32 bits, flottants,
+    # WAVE_FORMAT_EXTENSIBLE, autre taux) : ils passent par ffmpeg.
+    try:
+        wav = wave.open(path, 'rb')
+    except (wave.Error, EOFError):
+        return None
+    if wav.getsampwidth() != 2 or wav.getframerate() != sample_rate:
+        wav.close()
+        return None
+    channels = wav.getnchannels()
+
+    def blocks():
+        with wav:
+            while True:
+                data = wav.readframes(block_bytes // (2 * channels))
+                if not data:
+                    return
+                if channels > 1:
+                    samples = np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+                    data = samples.mean(axis=1).astype('<i2').tobytes()
+                yield data
+
+    return blocks()
+
+def _ffmpeg_blocks(path, sample_rate, block_bytes):
+    # ffmpeg décode n'importe quel format (m4a, mp3...) vers la sortie standard, sans fichier .wav.
+    # Ses messages vont dans un fichier temporaire (un tube plein bloquerait ffmpeg) et
+    # sont repris dans l'exception si le décodage échoue : un fichier corrompu ne doit
+    # pas passer pour un enregistrement vide.
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(
+            ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', path,
+             '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), '-'],
+            stdout=subprocess.PIPE, stderr=errors)
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                yield data
+        finally:
+            process.stdout.close()
+            process.wait()
+        if process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode('utf-8', 'replace').strip()
+            raise RuntimeError(f"ffmpeg n'a pas pu décoder {path} (code {process.returncode}) : {message}")
+
+# -------------------- Découpage sur les silences --------------------
+
+def split_on_silence(sample_rate, blocks, min_chunk=MIN_CHUNK, max_chunk=MAX_CHUNK,
+                     silence_db=SILENCE_DB, min_silence_ms=MIN_SILENCE_MS):
+    # Générateur de Chunk : coupe au milieu du premier silence assez long après min_chunk
+    # secondes, ou de force à max_chunk secondes
+    frame_bytes = 2 * sample_rate * FRAME_MS // 1000
+    silent_frames_needed = max(1, min_silence_ms // FRAME_MS)
+    min_bytes = int(min_chunk * sample_rate) * 2
+    max_bytes = int(max_chunk * sample_rate) * 2
+    threshold = 32768 * 10 ** (silence_db / 20)
+
+    buffer = bytearray()
+    chunk = bytearray()
+    silent_run = 0
+    index = 0
+    start = 0.0
+
+    def emit(cut):
+        nonlocal chunk, index, start
+        piece = Chunk(index, start, bytes(chunk[:cut]), sample_rate)
+        chunk = chunk[cut:]
+        index += 1
+        start = piece.end
+        return piece
+
+    for block in blocks:
+        buffer += block
+        usable = len(buffer) - len(buffer) % frame_bytes
+        if not usable:
+            continue
+        samples = np.frombuffer(bytes(buffer[:usable]), dtype='<i2').astype(np.float32).reshape(-1, frame_bytes // 2)
+        rms = np.sqrt((samples * samples).mean(axis=1))
+        for frame, level in enumerate(rms):
+            chunk += buffer[frame * frame_bytes:(frame + 1) * frame_bytes]
+            silent_run = silent_run + 1 if level < threshold else 0
+            if len(chunk) >= max_bytes:
+                yield emit(len(chunk))
+                silent_run = 0
+            elif silent_run >= silent_frames_needed and len(chunk) >= min_bytes:
+                yield emit(len(chunk) - silent_run // 2 * frame_bytes)
+                silent_run = 0
+        del buffer[:usable]
+    chunk += buffer
+    if chunk:
+        yield emit(len(chunk))
+
+# -------------------- Moteurs de reconnaissance --------------------
+
+class GoogleBackend:
+    # API Google Web Speech via speech_recognition (comme le notebook d'origine)
+    def __init__(self, language='en-US'):
+        import speech_recognition as sr
+        self.sr = sr
+        self.language = language
+
+    def __call__(self, pcm, sample_rate):
+        audio = self.sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self.sr.Recognizer().recognize_google(audio, language=self.language)
+        except self.sr.UnknownValueError:
+            return ""
+
+class SphinxBackend(GoogleBackend):
+    # Reconnaissance hors ligne (pocketsphinx)
+    def __call__(self, pcm, sample_rate):
+        audio = self.sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self.sr.Recognizer().recognize_sphinx(audio, language=self.language)
+        except self.sr.UnknownValueError:
+            return ""
+
+class StubBackend:
+    # Moteur factice pour les essais : décrit chaque morceau au lieu de le transcrire
+    def __call__(self, pcm, sample_rate):
+        seconds = len(pcm) / (2 * sample_rate)
+        level = np.sqrt(np.mean(np.frombuffer(pcm, dtype='<i2').astype(np.float32) ** 2)) if pcm else 0.0
+        return f"<{seconds:.1f} s, rms {level:.0f}>"
+
+BACKENDS = {'google': GoogleBackend, 'sphinx': SphinxBackend, 'stub': StubBackend}
+
+def make_backend(name='google', **options):
+    return BACKENDS[name](**options)
+
+# -------------------- Transcription --------------------
+
+def _recognize(backend, chunk):
+    try:
+        return Segment(chunk.start, chunk.end, backend(chunk.pcm, chunk.sample_rate))
+    except Exception as e:
+        return Segment(chunk.start, chunk.end, "", error=str(e))
+
+def transcribe(path, backend=None, workers=WORKERS, sample_rate=SAMPLE_RATE, **split_options):
+    # Générateur de Segment dans l'ordre de l'enregistrement
+    return transcribe_stream(*pcm_stream(path, sample_rate), backend, workers, **split_options)
+
+def transcribe_stream(sample_rate, blocks, backend=None, workers=WORKERS, **split_options):
+    # Comme transcribe, à partir de blocs PCM déjà décodés. Au plus 2 * workers morceaux
+    # sont en mémoire (en cours de reconnaissance ou en attente d'être rendus dans l'ordre)
+    backend = backend or make_backend()
+    chunks = split_on_silence(sample_rate, blocks, **split_options)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(_recognize, backend, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+def m4a_to_text(audio_file, backend=None, workers=WORKERS):
+    # Texte complet de l'enregistrement (les morceaux sans parole sont ignorés). Si le moteur
+    # a échoué sur un morceau (service indisponible...), lève une exception plutôt que de
+    # renvoyer un texte incomplet.
+    segments = list(transcribe(audio_file, backend, workers))
+    failed = [segment for segment in segments if segment.error]
+    if failed:
+        details = "; ".join(f"{format_timestamp(s.start)} - {format_timestamp(s.end)} : {s.error}" for s in failed)
+        raise RuntimeError(f"{len(failed)} morceau(x) sur {len(segments)} non transcrit(s) : {details}")
+    return " ".join(segment.text for segment in segments if segment.text)
@@ -0,0 +1,143 @@
+# Champ d'obstacles du jeu d'évitement stocké en tableaux NumPy (un tableau par attribut).
+# Le déplacement, la rotation et le recyclage se font en une opération par tableau ;
+# les sommets sont calculés à partir d'un polygone unitaire mis en cache par nombre de côtés.
+import numpy as np
+
+# Polygones unitaires (cos, sin des angles i * 2π / côtés), un par nombre de côtés
+_unit_polygons = {}
+
+def unit_polygon(sides):
+    polygon = _unit_polygons.get(sides)
+    if polygon is None:
+        angles = np.arange(sides) * (2 * np.pi / sides)
+        polygon = _unit_polygons[sides] = (np.cos(angles), np.sin(angles))
+    return polygon
+
+class SpatialHash:
+    # Grille uniforme : chaque obstacle est rangé dans la case de son centre. Les clés sont
+    # triées une fois par image, une requête ne lit que les quelques cases voisines.
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.order = np.empty(0, dtype=np.intp)
+
+    @staticmethod
+    def key(ix, iy):
+        return (ix + 0x8000) * 0x10000 + (iy + 0x8000)
+
+    def build(self, centers):
+        cells = np.floor(centers / self.cell_size).astype(np.int64)
+        keys = self.key(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def query(self, point, reach):
+        # Indices des objets dont le centre est dans une case touchée par le carré (point ± reach)
+        (x0, y0), (x1, y1) = np.floor((np.array([point, point]) + [[-reach], [reach]]) / self.cell_size).astype(int)
+        wanted = np.array([self.key(ix, iy) for ix in range(x0, x1 + 1) for iy in range(y0, y1 + 1)], dtype=np.int64)
+        starts = np.searchsorted(self.keys, wanted, 'left')
+        ends = np.searchsorted(self.keys, wanted, 'right')
+        return np.concatenate([self.order[a:b] for a, b in zip(starts, ends)])
+
+class ObstacleField:
+    def __init__(self, width, height, centers, sides, radii, colors, angular_velocities, base_speeds, rng=None,
+                 cell_size=None):
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.centers = np.array(centers, dtype=float).reshape(-1, 2)
+        self.sides = np.array(sides, dtype=np.intp)
+        self.radii = np.array(radii, dtype=float)
+        self.colors = np.array(colors, dtype=np.uint8).reshape(-1, 3)
+        self.rotations = np.zeros(len(self.sides))
+        self.angular_velocities = np.array(angular_velocities, dtype=float)
+        self.base_speeds = np.array(base_speeds, dtype=float)  # Vitesses initiales
+        self.speeds = self.base_speeds.copy()  # Vitesses actuelles
+        # Indices des obstacles regroupés par nombre de côtés (fixe pendant la partie)
+        self.groups = {int(n): np.flatnonzero(self.sides == n) for n in np.unique(self.sides)}
+        self._vertices = None
+        # Hachage spatial du large-phase, reconstruit après chaque pas
+        self.max_radius = float(self.radii.max()) if len(self.radii) else 0.0
+        self.grid = SpatialHash(cell_size or max(2 * self.max_radius, 1.0))
+        self._grid_dirty = True
+
+    @classmethod
+    def from_specs(cls, width, height, specs, rng=None):
+        # specs : (centre, côtés, rayon, couleur, vitesse angulaire, vitesse)
+        centers, sides, radii, colors, angular, speeds = zip(*specs)
+        return cls(width, height, centers, sides, radii, colors, angular, speeds, rng)
+
+    @classmethod
+    def random(cls, width, height, count, rng=None):
+        # Mode "bullet hell" : beaucoup de petits obstacles répartis à droite de l'écran
+        rng = rng if rng is not None else np.random.default_rng()
+        radii = rng.uniform(6, 18, count)
+        centers = np.column_stack((rng.uniform(width, 3 * width, count),
+                                   rng.uniform(radii, height - radii)))
+        return cls(width, height, centers, rng.integers(3, 7, count), radii,
+                   rng.integers(80, 256, (count, 3)), rng.uniform(0.01, 0.05, count),
+                   rng.uniform(1.5, 4.0, count), rng)
+
+    def __len__(self):
+        return len(self.sides)
+
+    def step(self, multiplier=1.0):
+        # Avance tous les obstacles d'une image et recycle ceux sortis par la gauche
+        self.speeds = self.base_speeds * multiplier
+        self.centers[:, 0] -= self.speeds
+        self.rotations += self.angular_velocities
+        gone = np.flatnonzero(self.centers[:, 0] + self.radii < 0)
+        if len(gone):
+            radii = self.radii[gone]
+            self.centers[gone, 0] = self.width + radii
+            self.centers[gone, 1] = self.rng.integers(radii.astype(int), (self.height - radii).astype(int) + 1)
+        self._vertices = None
+        self._grid_dirty = True
+
+    def polygons(self, rows, sides):
+        # Sommets (k, côtés, 2) des obstacles `rows`, qui ont tous `sides` côtés
+        ux, uy = unit_polygon(sides)
+        r = self.radii[rows, None]
+        rotations = self.rotations[rows, None]
+        c, s = np.cos(rotations), np.sin(rotations)
+        points = np.empty((len(rows), sides, 2))
+        # Rotation du polygone unitaire : cos(rot + a) = cos rot cos a - sin rot sin a
+        points[:, :, 0] = self.centers[rows, 0, None] + r * (c * ux - s * uy)
+        points[:, :, 1] = self.centers[rows, 1, None] + r * (s * ux + c * uy)
+        return points
+
+    def vertices(self):
+        # {côtés: (indices, sommets (k, côtés, 2))}, calculé au plus une fois par image
+        if self._vertices is None:
+            self._vertices = {sides: (rows, self.polygons(rows, sides)) for sides, rows in self.groups.items()}
+        return self._vertices
+
+    def near(self, point, radius):
+        # Large phase : obstacles des cases voisines dont le cercle englobant touche le cercle (point, radius)
+        if self._grid_dirty:
+            self.grid.build(self.centers)
+            self._grid_dirty = False
+        point = np.asarray(point, dtype=float)
+        rows = self.grid.query(point, radius + self.max_radius)
+        delta = self.centers[rows] - point
+        reach = self.radii[rows] + radius
+        return rows[(delta * delta).sum(axis=1) <= reach * reach]
+
+    def collisions(self, point, radius):
+        # Phase fine vectorisée (polygones convexes) : le cercle touche un obstacle si son centre
+        # est à l'intérieur du polygone ou à moins de `radius` de l'une de ses arêtes
+        point = np.asarray(point, dtype=float)
+        rows = self.near(point, radius)
+        hits = []
+        for sides in np.unique(self.sides[rows]):
+            group = rows[self.sides[rows] == sides]
+            a = self.polygons(group, int(sides))
+            edge = np.roll(a, -1, axis=1) - a
+            rel = point - a
+            t = np.clip((rel * edge).sum(axis=2) / (edge * edge).sum(axis=2), 0.0, 1.0)
+            gap = rel - t[:, :, None] * edge
+            touching = (gap * gap).sum(axis=2).min(axis=1) <= radius * radius
+            cross = edge[:, :, 0] * rel[:, :, 1] - edge[:, :, 1] * rel[:, :, 0]
+            inside = (cross >= 0).all(axis=1) | (cross <= 0).all(axis=1)
+            hits.append(group[touching | inside])
+        return np.concatenate(hits) if hits else rows
@@ -0,0 +1,159 @@
+# Cœur de simulation du jeu d'évitement, sans fenêtre : pas de temps fixe, horloge injectable,
+# générateur aléatoire initialisé par une graine et enregistrement / rejeu des entrées.
+# Deux simulations de même graine recevant les mêmes entrées donnent un état identique au bit près,
+# quelle que soit la durée réelle des images.
+import argparse
+import hashlib
+import json
+import math
+import time
+
+import numpy as np
+
+from avoid_field import ObstacleField
+
+WIDTH, HEIGHT = 800, 600
+TICK_RATE = 60  # Pas de simulation par seconde
+PLAYER_RADIUS = 15
+PLAYER_SPEED = 5  # Pixels par pas
+DIFFICULTY_PERIOD = 5 * TICK_RATE  # La difficulté augmente toutes les 5 secondes de jeu
+DIFFICULTY_STEP = 0.1
+
+# Entrée d'un pas : (bouton appuyé, cible x, cible y)
+IDLE = (False, 0.0, 0.0)
+
+class Simulation:
+    def __init__(self, seed=None, bullet_hell=0, width=WIDTH, height=HEIGHT):
+        self.seed = seed
+        self.bullet_hell = bullet_hell
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        if bullet_hell:
+            self.obstacles = ObstacleField.random(width, height, bullet_hell, self.rng)
+        else:
+            self.obstacles = ObstacleField.from_specs(width, height, [
+                ((width + 100, self.rng.integers(50, height - 50)), 3, 30, (255, 0, 0), 0.03, 3),
+                ((width + 300, self.rng.integers(50, height - 50)), 4, 40, (0, 255, 0), 0.02, 4),
+                ((width + 500, self.rng.integers(50, height - 50)), 5, 50, (0, 0, 255), 0.04, 2)
+            ], self.rng)
+        self.player = [width / 2, height - 50]
+        self.tick = 0
+        self.multiplier = 1.0
+        self.game_over = False
+
+    @property
+    def score(self):
+        # Secondes de jeu survécues, comptées en pas et non en temps réel
+        return self.tick // TICK_RATE
+
+    def step(self, command=IDLE):
+        if self.game_over:
+            return
+        self.advance(command)
+        self.collide()
+
+    def advance(self, command=IDLE):
+        # Déplacement du joueur, difficulté et obstacles (sans le test de collision)
+        pressed, target_x, target_y = command
+        x, y = self.player
+        if pressed:
+            dx, dy = target_x - x, target_y - y
+            length = math.hypot(dx, dy)
+            if length > PLAYER_SPEED:
+                dx, dy = dx / length * PLAYER_SPEED, dy / length * PLAYER_SPEED
+            x, y = x + dx, y + dy
+        # Empêcher de sortir de l'écran
+        self.player = [max(PLAYER_RADIUS, min(self.width - PLAYER_RADIUS, x)),
+                       max(PLAYER_RADIUS, min(self.height - PLAYER_RADIUS, y))]
+
+        self.tick += 1
+        if self.tick % DIFFICULTY_PERIOD == 0:
+            self.multiplier += DIFFICULTY_STEP
+        self.obstacles.step(self.multiplier)
+
+    def collide(self):
+        if len(self.obstacles.collisions(self.player, PLAYER_RADIUS)):
+            self.game_over = True
+
+    def digest(self):
+        # Empreinte de l'état complet, pour comparer deux exécutions
+        h = hashlib.sha256()
+        h.update(np.array([self.tick, self.multiplier, *self.player, self.game_over], dtype=float).tobytes())
+        h.update(self.obstacles.centers.tobytes())
+        h.update(self.obstacles.rotations.tobytes())
+        return h.hexdigest()
+
+class FixedTimestep:
+    # Convertit le temps écoulé (lu sur `clock`, en secondes) en nombre de pas fixes à simuler.
+    # Au-delà de `max_ticks` pas par image, le retard est abandonné : le jeu ralentit
+    # au lieu de s'emballer, et le résultat ne dépend que des entrées de chaque pas.
+    def __init__(self, rate=TICK_RATE, clock=time.perf_counter, max_ticks=5):
+        self.dt = 1 / rate
+        self.clock = clock
+        self.max_ticks = max_ticks
+        self.last = None
+        self.accumulator = 0.0
+
+    def ticks(self):
+        now = self.clock()
+        if self.last is not None:
+            self.accumulator += now - self.last
+        self.last = now
+        count = int(self.accumulator // self.dt)
+        if count > self.max_ticks:
+            count, self.accumulator = self.max_ticks, 0.0
+        else:
+            self.accumulator -= count * self.dt
+        return count
+
+class InputLog:
+    # Entrées pas à pas d'une partie, avec la graine et le mode, pour la rejouer à l'identique
+    def __init__(self, seed=None, bullet_hell=0, commands=None):
+        self.seed = seed
+        self.bullet_hell = bullet_hell
+        self.commands = commands if commands is not None else []
+
+    def record(self, command):
+        self.commands.append(command)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'seed': self.seed, 'bullet_hell': self.bullet_hell,
+                       'commands': [[int(p), x, y] for p, x, y in self.commands]}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['seed'], data['bullet_hell'], [(bool(p), x, y) for p, x, y in data['commands']])
+
+def replay(log):
+    # Rejoue toutes les entrées enregistrées et renvoie la simulation finale
+    sim = Simulation(log.seed, log.bullet_hell)
+    for command in log.commands:
+        sim.step(command)
+    return sim
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation sans fenêtre du jeu d'évitement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ticks', type=int, default=10000, help='pas maximum sans fichier de rejeu')
+    parser.add_argument('--bullet-hell', type=int, default=0, metavar='N')
+    parser.add_argument('--replay', help='fichier JSON enregistré par le jeu (--record)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.replay:
+        sim = replay(InputLog.load(args.replay))
+    else:
+        sim = Simulation(args.seed, args.bullet_hell)
+        while sim.tick < args.ticks and not sim.game_over:
+            sim.step()
+    seconds = time.perf_counter() - start
+    print(f"{sim.tick} pas en {seconds:.2f} s ({sim.tick / seconds:.0f} pas/s)")
+    print(f"score {sim.score}, difficulté x{sim.multiplier:.1f}, {'perdu' if sim.game_over else 'en vie'}")
+    print(f"empreinte {sim.digest()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Banc d'essai des analyseurs HTML du scraper sur des pages de résultats enregistrées
+# (par défaut celles de fixtures/wikipedia_search, dont certains résultats n'ont pas d'extrait).
+# Pour chaque analyseur : lignes extraites par seconde et pic mémoire (tracemalloc ne voit
+# que les allocations Python : celles faites en C par lxml / selectolax sont sous-estimées).
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+
+from web_scrapper import available_parsers, parse_rows
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wikipedia_search')
+
+def synthetic_page(index, results=20):
+    # Page au format des recherches Wikipédia, avec l'habillage (menus, pied de page) autour
+    chrome = '<div class="vector-menu"><ul>' + '<li><a href="/wiki/X">Lien</a></li>' * 200 + '</ul></div>'
+    items = ''.join(
+        f'<li class="mw-search-result"><div class="mw-search-result-heading"><a href="/wiki/P{index}_{i}">'
+        f'Page {index} {i}</a></div><div class="searchresult">Résumé <span class="searchmatch">{i}</span> '
+        f'{"texte " * 30}</div><div class="mw-search-result-data">12 KB (1,234 words)</div></li>'
+        for i in range(results))
+    return (f'<html><head><title>Search</title></head><body>{chrome}'
+            f'<ul class="mw-search-results">{items}</ul>{chrome}</body></html>')
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+def bench(parser, pages, repeat):
+    # Temps mesuré sans tracemalloc (qui ralentit surtout les analyseurs en Python pur),
+    # puis pic mémoire sur un passage séparé
+    start = time.perf_counter()
+    rows = 0
+    for _ in range(repeat):
+        for html in pages:
+            rows += len(parse_rows(html, parser))
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    for html in pages:
+        parse_rows(html, parser)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, seconds, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les analyseurs HTML du scraper")
+    parser.add_argument('--pages', default=FIXTURES, help='dossier de pages de résultats enregistrées (*.html)')
+    parser.add_argument('--synthetic', type=int, default=None, help='N pages générées au lieu des pages enregistrées')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = [synthetic_page(i) for i in range(args.synthetic)] if args.synthetic else load_pages(args.pages)
+    if not pages:
+        parser.error(f"aucune page .html dans {args.pages}")
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1e6:.1f} Mo")
+    print(f"{'analyseur':<12}{'lignes/s':>12}{'pic (Mo)':>12}")
+    for name in available_parsers():
+        rows, seconds, peak = bench(name, pages, args.repeat)
+        print(f"{name:<12}{rows / seconds:>12.0f}{peak / 1e6:>12.2f}")
+
+if __name__ == '__main__':
+    main()
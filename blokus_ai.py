@@ -0,0 +1,169 @@
+# IA pour Blokus : joueurs aléatoire et glouton, et recherche arborescente Monte-Carlo (MCTS)
+# parallélisée à la racine sur plusieurs processus. Aucune dépendance à pygame.
+import os
+import math
+import time
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from blokus_core import COLORS, BlokusState
+from blokus_eval import WEIGHTS, best_move
+
+# Temps de réflexion de l'IA (secondes par coup)
+AI_TIME_BUDGET = 1.0
+
+# Joueur aléatoire : coup uniforme parmi les coups légaux
+class RandomPlayer:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose_move(self, state):
+        return state.board.random_move(COLORS[state.turn], self.rng)
+
+# Joueur glouton : meilleur placement selon l'évaluation vectorisée (blokus_eval)
+class GreedyPlayer:
+    def __init__(self, seed=None, weights=WEIGHTS):
+        self.rng = random.Random(seed)
+        self.weights = weights
+
+    def choose_move(self, state):
+        return best_move(state.board, COLORS[state.turn], self.rng, self.weights)
+
+class MCTSNode:
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, player, parent, state):
+        self.move = move
+        self.player = player  # joueur qui a joué self.move
+        self.parent = parent
+        self.children = []
+        self.untried = list(state.legal_moves())
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+def rollout_winner(state, rng, policy='random'):
+    # Partie simulée jusqu'à ce que plus personne ne puisse jouer, en coups aléatoires
+    # ou gloutons (policy='greedy')
+    depth = 0
+    while True:
+        color = COLORS[state.turn]
+        if policy == 'greedy':
+            pid = best_move(state.board, color, rng)
+        else:
+            pid = state.board.random_move(color, rng)
+        if pid is None:
+            break
+        state.make_move(pid)
+        depth += 1
+    winner = state.winner()
+    for _ in range(depth):
+        state.unmake_move()
+    return winner
+
+def mcts_search(state, budget, rng, exploration=1.4, policy='random'):
+    # Un arbre UCT complet dans le temps imparti ; renvoie les visites des coups racine
+    root = MCTSNode(None, None, None, state)
+    deadline = time.perf_counter() + budget
+    playouts = 0
+    while time.perf_counter() < deadline and (root.untried or root.children):
+        node = root
+        depth = 0
+        # Sélection
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            state.make_move(node.move)
+            depth += 1
+        # Expansion
+        if node.untried:
+            i = rng.randrange(len(node.untried))
+            node.untried[i], node.untried[-1] = node.untried[-1], node.untried[i]
+            move = node.untried.pop()
+            player = state.turn
+            state.make_move(move)
+            depth += 1
+            child = MCTSNode(move, player, node, state)
+            node.children.append(child)
+            node = child
+        # Simulation puis rétropropagation
+        winner = rollout_winner(state, rng, policy)
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1
+            node = node.parent
+        for _ in range(depth):
+            state.unmake_move()
+        playouts += 1
+    return {child.move: child.visits for child in root.children}, playouts
+
+def _mcts_worker(snapshot, budget, seed, exploration, policy):
+    state = BlokusState.from_snapshot(snapshot)
+    return mcts_search(state, budget, random.Random(seed), exploration, policy)
+
+# Parallélisation à la racine : un arbre indépendant par processus, puis on additionne
+# les visites des coups racine et on joue le plus visité
+class MCTSPlayer:
+    def __init__(self, budget=AI_TIME_BUDGET, workers=None, exploration=1.4, seed=None, policy='random'):
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self.pool = None
+        self.last_stats = None
+
+    def choose_move(self, state):
+        start = time.perf_counter()
+        if self.workers == 1:
+            # Un seul arbre : recherche directement sur l'état (make/unmake le laissent intact)
+            visits, playouts = mcts_search(state, self.budget, self.rng, self.exploration, self.policy)
+        else:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            snapshot = state.snapshot()
+            jobs = [self.pool.submit(_mcts_worker, snapshot, self.budget, self.rng.getrandbits(64),
+                                     self.exploration, self.policy)
+                    for _ in range(self.workers)]
+            visits = Counter()
+            playouts = 0
+            for job in jobs:
+                counts, count = job.result()
+                visits.update(counts)
+                playouts += count
+        seconds = time.perf_counter() - start
+        self.last_stats = {'playouts': playouts, 'seconds': seconds,
+                           'playouts_per_sec': playouts / seconds if seconds else 0.0}
+        return max(visits, key=visits.get) if visits else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+PLAYERS = ('random', 'greedy', 'mcts', 'mcts-greedy')
+
+def make_player(name, budget=AI_TIME_BUDGET, seed=None):
+    if name.startswith('mcts'):
+        # Dans une partie simulée, chaque recherche reste dans le processus courant
+        policy = 'greedy' if name == 'mcts-greedy' else 'random'
+        return MCTSPlayer(budget, workers=1, seed=seed, policy=policy)
+    if name == 'greedy':
+        return GreedyPlayer(seed)
+    return RandomPlayer(seed)
+
+# Partie complète IA contre IA ; renvoie l'état final et le nombre de coups joués
+def play_game(players, size=None, official=False):
+    state = BlokusState(size, official)
+    moves = 0
+    while not state.is_game_over():
+        state.make_move(players[state.turn].choose_move(state))
+        moves += 1
+    return state, moves
@@ -0,0 +1,410 @@
+# Cœur du jeu Blokus, sans affichage : plateau en masques de bits, règles et coups réversibles.
+# Utilisé par l'interface pygame (Blokus_game.py), l'IA (blokus_ai.py) et le simulateur.
+import random
+
+# Couleurs des joueurs
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+YELLOW = (255, 220, 0)
+GREEN = (0, 170, 0)
+COLORS = {'blue': BLUE, 'red': RED, 'yellow': YELLOW, 'green': GREEN}
+
+# Taille du plateau
+GRID_SIZE = 12
+
+# Règles officielles : plateau 20x20, quatre joueurs dans l'ordre du jeu
+OFFICIAL_SIZE = 20
+OFFICIAL_PLAYERS = ('blue', 'yellow', 'red', 'green')
+
+# Définition des formes de pièces
+PIECES = {
+    'blue': [
+        [(0, 0)], [(0, 0), (1, 0)], [(0, 0), (1, 0), (2, 0)], [(0, 0), (1, 0), (2, 0), (0, 1)], [(0, 0), (1, 0), (1, 1)],
+        [(0, 0), (1, 0), (2, 0), (3, 0)], [(0, 0), (0, 1)], [(0, 0), (1, 0), (2, 0), (2, 1)], [(0, 0), (1, 0), (0, 1), (1, 1)],
+        [(0, 0), (1, 0), (1, 1), (2, 1)], [(0, 0), (1, 0), (1, 1), (2, 0)]
+    ],
+    'red': [
+        [(0, 0)], [(0, 0), (1, 0)], [(0, 0), (1, 0), (2, 0)], [(0, 0), (1, 0), (2, 0), (0, 1)], [(0, 0), (1, 0), (1, 1)],
+        [(0, 0), (1, 0), (2, 0), (3, 0)], [(0, 0), (0, 1)], [(0, 0), (1, 0), (2, 0), (2, 1)], [(0, 0), (1, 0), (0, 1), (1, 1)],
+        [(0, 0), (1, 0), (1, 1), (2, 1)], [(0, 0), (1, 0), (1, 1), (2, 0)]
+    ]
+}
+
+# Les 21 pièces officielles (1 monomino, 1 domino, 2 triominos, 5 tétrominos, 12 pentominos)
+OFFICIAL_PIECES = [
+    [(0, 0)],
+    [(0, 0), (1, 0)],
+    [(0, 0), (1, 0), (2, 0)], [(0, 0), (0, 1), (1, 1)],
+    [(0, 0), (1, 0), (2, 0), (3, 0)], [(0, 0), (0, 1), (0, 2), (1, 2)], [(0, 0), (1, 0), (2, 0), (1, 1)],
+    [(0, 0), (1, 0), (0, 1), (1, 1)], [(1, 0), (2, 0), (0, 1), (1, 1)],
+    [(1, 0), (2, 0), (0, 1), (1, 1), (1, 2)], [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)],
+    [(0, 0), (0, 1), (0, 2), (0, 3), (1, 3)], [(0, 0), (0, 1), (1, 1), (1, 2), (1, 3)],
+    [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)], [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2)],
+    [(0, 0), (2, 0), (0, 1), (1, 1), (2, 1)], [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)],
+    [(0, 0), (0, 1), (1, 1), (1, 2), (2, 2)], [(1, 0), (0, 1), (1, 1), (2, 1), (1, 2)],
+    [(1, 0), (0, 1), (1, 1), (1, 2), (1, 3)], [(0, 0), (1, 0), (1, 1), (1, 2), (2, 2)]
+]
+
+def orientations(piece):
+    # Les 8 rotations/symétries d'une pièce, ramenées en (0, 0) et dédoublonnées par forme canonique
+    result = []
+    seen = set()
+    cells = list(piece)
+    for _ in range(4):
+        for variant in (cells, [(-cx, cy) for cx, cy in cells]):
+            min_x = min(cx for cx, _ in variant)
+            min_y = min(cy for _, cy in variant)
+            canonical = tuple(sorted((cx - min_x, cy - min_y) for cx, cy in variant))
+            if canonical not in seen:
+                seen.add(canonical)
+                result.append(list(canonical))
+        cells = [(-cy, cx) for cx, cy in cells]
+    return result
+
+# Masques de bits des pièces : une case (x, y) correspond au bit y * size + x.
+# Chaque forme est convertie une seule fois par taille de plateau.
+_piece_masks = {}
+
+def piece_mask(piece, size=GRID_SIZE):
+    key = (tuple(piece), size)
+    entry = _piece_masks.get(key)
+    if entry is None:
+        min_x = min(cx for cx, _ in piece)
+        min_y = min(cy for _, cy in piece)
+        max_x = max(cx for cx, _ in piece)
+        max_y = max(cy for _, cy in piece)
+        mask = 0
+        for cx, cy in piece:
+            mask |= 1 << ((cy - min_y) * size + (cx - min_x))
+        entry = _piece_masks[key] = (mask, min_x, min_y, max_x, max_y)
+    return entry
+
+# Table des placements : toutes les positions (pièce, x, y) d'une liste de pièces sur un
+# plateau vide, avec pour chaque case la liste des placements qui la recouvrent.
+# Avec rotations=True, chaque pièce est déclinée dans toutes ses orientations.
+# Elle ne dépend que des formes et de la taille, elle est donc construite une seule fois.
+class PlacementTable:
+    def __init__(self, pieces, size, rotations=False):
+        self.size = size
+        self.placements = []  # (pièce, x, y, masque)
+        self.masks = []  # masque de chaque placement
+        self.shapes = []  # numéro de la pièce d'origine de chaque placement
+        self.index = {}  # (cases triées de la pièce, x, y) -> numéro de placement
+        self.by_cell = [[] for _ in range(size * size)]
+        for i, piece in enumerate(pieces):
+            for variant in orientations(piece) if rotations else [piece]:
+                mask, min_x, min_y, max_x, max_y = piece_mask(variant, size)
+                for y in range(-min_y, size - max_y):
+                    for x in range(-min_x, size - max_x):
+                        pid = len(self.placements)
+                        placed = mask << ((y + min_y) * size + x + min_x)
+                        self.placements.append((variant, x, y, placed))
+                        self.masks.append(placed)
+                        self.shapes.append(i)
+                        self.index[(tuple(sorted(variant)), x, y)] = pid
+                        for cx, cy in variant:
+                            self.by_cell[(cy + y) * size + cx + x].append(pid)
+
+_placement_tables = {}
+
+def placement_table(pieces, size=GRID_SIZE, rotations=False):
+    key = (tuple(tuple(piece) for piece in pieces), size, rotations)
+    table = _placement_tables.get(key)
+    if table is None:
+        table = _placement_tables[key] = PlacementTable(pieces, size, rotations)
+    return table
+
+# Clés de Zobrist (entiers 64 bits) : une par (couleur, case) et une par joueur au trait.
+# Elles sont tirées avec une graine fixe pour que le hachage d'une position soit reproductible.
+ZOBRIST_TURN = {name: random.Random(f"tour-{name}").getrandbits(64) for name in COLORS}
+_zobrist_keys = {}
+
+def zobrist_keys(color, size=GRID_SIZE):
+    key = (color, size)
+    keys = _zobrist_keys.get(key)
+    if keys is None:
+        rng = random.Random(f"{color}-{size}")
+        keys = _zobrist_keys[key] = [rng.getrandbits(64) for _ in range(size * size)]
+    return keys
+
+# Classe pour gérer le plateau de jeu (un masque de bits par couleur + un masque d'occupation)
+class Board:
+    def __init__(self, size=GRID_SIZE, pieces=None):
+        self.size = size
+        self.occupied = 0
+        if pieces is None:
+            pieces = {COLORS[name]: PIECES[name] for name in PIECES}
+        self.masks = {color: 0 for color in pieces}
+        # Coups légaux par couleur (numéros de placement), tenus à jour par place_piece
+        self.tables = {color: placement_table(pieces[color], size) for color in pieces}
+        self.legal = {color: set(range(len(table.placements))) for color, table in self.tables.items()}
+        # Hachage de Zobrist de la position et pile des coups joués (pour unmake_move)
+        self.hash = 0
+        self.history = []
+
+    @property
+    def grid(self):
+        # Vue "liste de listes" reconstruite à partir des masques (utilisée pour l'affichage)
+        grid = [[None for _ in range(self.size)] for _ in range(self.size)]
+        for color, mask in self.masks.items():
+            while mask:
+                low = mask & -mask
+                index = low.bit_length() - 1
+                grid[index // self.size][index % self.size] = color
+                mask ^= low
+        return grid
+
+    def placement_mask(self, piece, x, y):
+        # Masque de la pièce posée en (x, y), ou None si elle dépasse du plateau
+        mask, min_x, min_y, max_x, max_y = piece_mask(piece, self.size)
+        if not (0 <= x + min_x and x + max_x < self.size and 0 <= y + min_y and y + max_y < self.size):
+            return None
+        return mask << ((y + min_y) * self.size + x + min_x)
+
+    def place_piece(self, piece, color, x, y):
+        pid = self.tables[color].index.get((tuple(sorted(piece)), x, y))
+        if pid is None:
+            raise ValueError(f"Placement impossible en ({x}, {y})")
+        self.make_move(color, pid)
+
+    def make_move(self, color, pid):
+        # Joue le placement numéro pid de la table de cette couleur
+        mask = self.tables[color].masks[pid]
+        self.masks[color] |= mask
+        self.occupied |= mask
+        self.history.append((color, pid, mask, {other: set() for other in self.legal}))
+        removed = self.history[-1][3]
+        keys = zobrist_keys(color, self.size)
+        # On retire uniquement les placements qui recouvrent les cases nouvellement remplies
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            self.hash ^= keys[index]
+            for other, moves in self.legal.items():
+                covering = moves.intersection(self.tables[other].by_cell[index])
+                moves -= covering
+                removed[other] |= covering
+            mask ^= low
+
+    def unmake_move(self):
+        color, _, mask, removed = self.history.pop()
+        self.masks[color] ^= mask
+        self.occupied ^= mask
+        for other, moves in removed.items():
+            self.legal[other] |= moves
+        self._rehash(color, mask)
+
+    def _rehash(self, color, mask):
+        keys = zobrist_keys(color, self.size)
+        while mask:
+            low = mask & -mask
+            self.hash ^= keys[low.bit_length() - 1]
+            mask ^= low
+
+    def is_valid_position(self, piece, x, y, color=None):
+        mask = self.placement_mask(piece, x, y)
+        return mask is not None and not self.occupied & mask
+
+    def moves(self, color):
+        # Numéros de placement légaux pour cette couleur
+        return self.legal[color]
+
+    def legal_moves(self, color):
+        placements = self.tables[color].placements
+        return [placements[pid][:3] for pid in self.moves(color)]
+
+    def color_at(self, x, y):
+        bit = 1 << (y * self.size + x)
+        for color, mask in self.masks.items():
+            if mask & bit:
+                return color
+        return None
+
+    def count(self, color):
+        return self.masks.get(color, 0).bit_count()
+
+    def random_move(self, color, rng=random):
+        # Tirage uniforme parmi les coups légaux : quand ils sont nombreux, quelques essais par
+        # rejet dans la table évitent de recopier tout l'ensemble à chaque coup d'une simulation
+        moves = self.moves(color)
+        if not moves:
+            return None
+        count = len(self.tables[color].placements)
+        if len(moves) * 8 >= count:
+            for _ in range(8):
+                pid = rng.randrange(count)
+                if pid in moves:
+                    return pid
+        return rng.choice(tuple(moves))
+
+# Plateau aux règles officielles : chaque pièce ne sert qu'une fois, dans n'importe quelle
+# orientation ; une nouvelle pièce doit toucher une pièce de sa couleur par un coin et jamais
+# par un côté, la première couvrant le coin de départ du joueur.
+# Les coups sont générés uniquement à partir des "ancres" (cases libres en diagonale de ses
+# pièces sans contact latéral), au lieu d'essayer chaque pièce sur chaque case.
+class CornerBoard(Board):
+    def __init__(self, size=OFFICIAL_SIZE, colors=None, pieces=OFFICIAL_PIECES):
+        self.size = size
+        self.occupied = 0
+        if colors is None:
+            colors = [COLORS[name] for name in OFFICIAL_PLAYERS]
+        self.masks = {color: 0 for color in colors}
+        table = placement_table(pieces, size, rotations=True)
+        self.tables = {color: table for color in colors}
+        self.remaining = {color: (1 << len(pieces)) - 1 for color in colors}
+        corners = [(0, 0), (size - 1, 0), (size - 1, size - 1), (0, size - 1)]
+        if len(colors) == 2:
+            corners = corners[::2]
+        self.start = {color: 1 << (y * size + x) for color, (x, y) in zip(colors, corners)}
+        # Masques utiles aux décalages : plateau complet, première et dernière colonne
+        self.full = (1 << (size * size)) - 1
+        self.first_column = sum(1 << (y * size) for y in range(size))
+        self.last_column = self.first_column << (size - 1)
+        self.hash = 0
+        self.history = []
+        self._moves = {}  # coups légaux par couleur, recalculés après chaque changement
+
+    def _sides(self, mask):
+        size = self.size
+        return (((mask << 1) & ~self.first_column) | ((mask >> 1) & ~self.last_column)
+                | (mask << size) | (mask >> size)) & self.full
+
+    def _corners(self, mask):
+        size = self.size
+        # Masqué avant le décalage vertical : le bit size * size (voisin à droite de la dernière
+        # case) redescendrait sinon sur la case (0, size - 1)
+        horizontal = (((mask << 1) & ~self.first_column) | ((mask >> 1) & ~self.last_column)) & self.full
+        return ((horizontal << size) | (horizontal >> size)) & self.full
+
+    def anchors(self, color):
+        own = self.masks[color]
+        if not own:
+            return self.start[color] & ~self.occupied
+        return self._corners(own) & ~(self._sides(own) | self.occupied)
+
+    def moves(self, color):
+        moves = self._moves.get(color)
+        if moves is None:
+            table = self.tables[color]
+            forbidden = self.occupied | self._sides(self.masks[color])
+            remaining = self.remaining[color]
+            moves = set()
+            anchors = self.anchors(color)
+            while anchors:
+                low = anchors & -anchors
+                for pid in table.by_cell[low.bit_length() - 1]:
+                    if remaining >> table.shapes[pid] & 1 and not table.masks[pid] & forbidden:
+                        moves.add(pid)
+                anchors ^= low
+            self._moves[color] = moves
+        return moves
+
+    def is_valid_position(self, piece, x, y, color=None):
+        pid = self.tables[color].index.get((tuple(sorted(piece)), x, y))
+        return pid is not None and pid in self.moves(color)
+
+    def make_move(self, color, pid):
+        table = self.tables[color]
+        mask = table.masks[pid]
+        self.masks[color] |= mask
+        self.occupied |= mask
+        self.remaining[color] &= ~(1 << table.shapes[pid])
+        self.history.append((color, pid, mask))
+        self._rehash(color, mask)
+        self._moves.clear()
+
+    def unmake_move(self):
+        color, pid, mask = self.history.pop()
+        self.masks[color] ^= mask
+        self.occupied ^= mask
+        self.remaining[color] |= 1 << self.tables[color].shapes[pid]
+        self._rehash(color, mask)
+        self._moves.clear()
+
+# État d'une partie : plateau, joueur au trait et scores, sans aucune dépendance à pygame.
+# Un joueur qui ne peut plus poser de pièce passe son tour ; la partie s'arrête quand
+# plus personne ne peut jouer.
+class BlokusState:
+    def __init__(self, size=None, official=False):
+        self.official = official
+        if official:
+            self.players = OFFICIAL_PLAYERS
+            self.board = CornerBoard(size or OFFICIAL_SIZE, [COLORS[name] for name in self.players])
+        else:
+            self.players = ('blue', 'red')
+            self.board = Board(size or GRID_SIZE)
+        self.turn = self.players[0]
+        self.scores = {name: 0 for name in self.players}
+        self.history = []  # (joueur au trait, son score) avant chaque make_move
+
+    def place(self, piece, x, y):
+        # Pose une pièce pour le joueur au trait ; renvoie False si la position est invalide
+        if not self.board.is_valid_position(piece, x, y, COLORS[self.turn]):
+            return False
+        self.board.place_piece(piece, COLORS[self.turn], x, y)
+        self.update_score()
+        return True
+
+    def update_score(self):
+        for name in self.players:
+            self.scores[name] = self.board.count(COLORS[name])
+
+    def following(self, turn):
+        # Prochain joueur qui a encore un coup (ou simplement le suivant si personne n'en a)
+        i = self.players.index(turn)
+        for step in range(1, len(self.players) + 1):
+            name = self.players[(i + step) % len(self.players)]
+            if self.board.moves(COLORS[name]):
+                return name
+        return self.players[(i + 1) % len(self.players)]
+
+    def next_turn(self):
+        self.turn = self.following(self.turn)
+
+    def legal_moves(self):
+        return self.board.moves(COLORS[self.turn])
+
+    # Coup réversible pour la recherche : met à jour plateau, score, trait et hachage
+    def make_move(self, pid):
+        color = COLORS[self.turn]
+        self.history.append((self.turn, self.scores[self.turn]))
+        self.board.make_move(color, pid)
+        self.scores[self.turn] = self.board.count(color)
+        self.turn = self.following(self.turn)
+
+    def unmake_move(self):
+        self.board.unmake_move()
+        self.turn, self.scores[self.turn] = self.history.pop()
+
+    @property
+    def hash(self):
+        return self.board.hash ^ ZOBRIST_TURN[self.turn]
+
+    def snapshot(self):
+        # Description compacte (et sérialisable) de la position : les coups joués depuis le début
+        moves = [entry[:2] for entry in self.board.history]
+        return (self.board.size, self.official, self.turn, moves)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        size, official, turn, moves = snapshot
+        state = cls(size, official)
+        for color, pid in moves:
+            state.board.make_move(color, pid)
+        state.turn = turn
+        state.update_score()
+        return state
+
+    def is_game_over(self):
+        return not self.legal_moves()
+
+    def winner(self):
+        best = max(self.scores.values())
+        leaders = [name for name in self.players if self.scores[name] == best]
+        return leaders[0] if len(leaders) == 1 else None
+
+    def declare_winner(self):
+        winner = self.winner()
+        if winner is None:
+            return "It's a tie!"
+        return f"{winner.capitalize()} wins!"
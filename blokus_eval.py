@@ -0,0 +1,114 @@
+# Évaluation vectorisée (NumPy) de tous les placements légaux d'une couleur en une seule passe.
+# Le plateau est converti en tableaux booléens ; les cases voisines (côtés, coins) sont
+# obtenues par décalage de ces tableaux, puis chaque placement lit ses cases par indexation.
+import numpy as np
+
+# Poids par défaut : cases gagnées, nouveaux coins ouverts, coins adverses bloqués
+WEIGHTS = (1.0, 0.6, 0.8)
+
+SIDES = ((0, 1), (0, -1), (1, 0), (-1, 0))
+CORNERS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+def mask_plane(board, mask):
+    # Vue NumPy (size x size, booléens) d'un masque de bits du plateau
+    n = board.size * board.size
+    data = np.frombuffer(mask.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(data, bitorder='little')[:n].astype(bool).reshape(board.size, board.size)
+
+def shift(plane, dy, dx):
+    size = plane.shape[0]
+    out = np.zeros_like(plane)
+    out[max(dy, 0):size + min(dy, 0), max(dx, 0):size + min(dx, 0)] = \
+        plane[max(-dy, 0):size + min(-dy, 0), max(-dx, 0):size + min(-dx, 0)]
+    return out
+
+def neighbours(plane, offsets):
+    out = np.zeros_like(plane)
+    for dy, dx in offsets:
+        out |= shift(plane, dy, dx)
+    return out
+
+def anchor_plane(board, color, own, empty):
+    # Cases libres touchant la couleur par un coin sans la toucher par un côté
+    if not own.any():
+        start = getattr(board, 'start', {}).get(color, 0)
+        return mask_plane(board, start) & empty
+    return neighbours(own, CORNERS) & ~neighbours(own, SIDES) & empty
+
+# Pour chaque table de placements : indices des cases de chaque placement et de son
+# "anneau de coins" (cases en diagonale de la pièce sans contact latéral), complétés par
+# une case sentinelle (index size * size, toujours fausse) pour former des tableaux réguliers.
+_table_arrays = {}
+
+def _ring(variant):
+    cells = set(variant)
+    sides = {(cx + dx, cy + dy) for cx, cy in cells for dy, dx in SIDES}
+    corners = {(cx + dx, cy + dy) for cx, cy in cells for dy, dx in CORNERS}
+    return sorted(corners - sides - cells)
+
+def table_arrays(table):
+    arrays = _table_arrays.get(table)
+    if arrays is None:
+        size = table.size
+        sentinel = size * size
+        count = len(table.placements)
+        xs = np.fromiter((p[1] for p in table.placements), dtype=np.intp, count=count)
+        ys = np.fromiter((p[2] for p in table.placements), dtype=np.intp, count=count)
+        # Regroupe les placements par orientation : les décalages relatifs sont communs au groupe
+        variants = {}
+        group = np.empty(count, dtype=np.intp)
+        for pid, placement in enumerate(table.placements):
+            group[pid] = variants.setdefault(id(placement[0]), (len(variants), placement[0]))[0]
+        offsets = [(g, variant, _ring(variant)) for g, variant in variants.values()]
+        cells = np.full((count, max(len(v) for _, v, _ in offsets)), sentinel, dtype=np.intp)
+        ring = np.full((count, max(len(r) for _, _, r in offsets)), sentinel, dtype=np.intp)
+        for g, variant, variant_ring in offsets:
+            rows = np.flatnonzero(group == g)
+            for target, rel in ((cells, variant), (ring, variant_ring)):
+                rel = np.array(rel, dtype=np.intp)
+                cx = xs[rows, None] + rel[None, :, 0]
+                cy = ys[rows, None] + rel[None, :, 1]
+                inside = (cx >= 0) & (cx < size) & (cy >= 0) & (cy < size)
+                target[rows, :len(rel)] = np.where(inside, cy * size + cx, sentinel)
+        arrays = _table_arrays[table] = (cells, ring)
+    return arrays
+
+def evaluate_moves(board, color, moves=None):
+    # Renvoie (numéros de placement, caractéristiques) ; caractéristiques est un tableau (n, 3) :
+    # cases gagnées, nouveaux coins ouverts, coins adverses bloqués
+    if moves is None:
+        moves = board.moves(color)
+    pids = np.fromiter(moves, dtype=np.intp, count=len(moves))
+    cells, ring = table_arrays(board.tables[color])
+
+    planes = {other: mask_plane(board, mask) for other, mask in board.masks.items()}
+    empty = ~np.logical_or.reduce(list(planes.values()))
+    own = planes[color]
+    # Cases qui deviendraient de nouveaux coins : libres, sans contact latéral, pas déjà des ancres
+    free = empty & ~neighbours(own, SIDES) & ~anchor_plane(board, color, own, empty)
+    blocked = np.zeros(own.shape, dtype=np.intp)
+    for other, plane in planes.items():
+        if other != color:
+            blocked += anchor_plane(board, other, plane, empty)
+
+    sentinel = board.size * board.size
+    free = np.append(free.ravel(), False)
+    blocked = np.append(blocked.ravel(), 0)
+    features = np.empty((len(pids), 3), dtype=np.intp)
+    features[:, 0] = (cells[pids] != sentinel).sum(axis=1)
+    features[:, 1] = free[ring[pids]].sum(axis=1)
+    features[:, 2] = blocked[cells[pids]].sum(axis=1)
+    return pids, features
+
+def score_moves(board, color, weights=WEIGHTS, moves=None):
+    pids, features = evaluate_moves(board, color, moves)
+    return pids, features @ np.asarray(weights, dtype=float)
+
+def best_move(board, color, rng, weights=WEIGHTS):
+    # Meilleur placement selon les poids, égalités départagées au hasard
+    moves = board.moves(color)
+    if not moves:
+        return None
+    pids, scores = score_moves(board, color, weights, moves)
+    best = np.flatnonzero(scores == scores.max())
+    return int(pids[best[rng.randrange(len(best))]])
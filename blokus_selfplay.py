@@ -0,0 +1,52 @@
+# Simulateur Blokus sans affichage : parties IA contre IA réparties sur plusieurs processus.
+# Exemple : python blokus_selfplay.py --games 200 --blue random --red mcts --budget 0.05
+#           python blokus_selfplay.py --games 50 --official
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from blokus_core import OFFICIAL_PLAYERS
+from blokus_ai import AI_TIME_BUDGET, PLAYERS, make_player, play_game
+
+def run_game(index, kinds, budget, size, official, seed):
+    players = {name: make_player(kind, budget, seed * 1000003 + 4 * index + i)
+               for i, (name, kind) in enumerate(kinds.items())}
+    state, moves = play_game(players, size, official)
+    return state.winner(), moves
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parties Blokus IA contre IA, sans affichage")
+    parser.add_argument('--games', type=int, default=100, help="nombre de parties")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    for name in OFFICIAL_PLAYERS:
+        parser.add_argument(f'--{name}', choices=PLAYERS, default='random')
+    parser.add_argument('--budget', type=float, default=AI_TIME_BUDGET, help="secondes par coup pour mcts")
+    parser.add_argument('--size', type=int, default=None, help="taille du plateau")
+    parser.add_argument('--official', action='store_true', help="règles officielles à quatre joueurs (20x20)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    names = OFFICIAL_PLAYERS if args.official else ('blue', 'red')
+    kinds = {name: getattr(args, name) for name in names}
+
+    results = Counter()
+    total_moves = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = [pool.submit(run_game, i, kinds, args.budget, args.size, args.official, args.seed)
+                for i in range(args.games)]
+        for job in jobs:
+            winner, moves = job.result()
+            results[winner or 'tie'] += 1
+            total_moves += moves
+    seconds = time.perf_counter() - start
+
+    print(f"{args.games} parties en {seconds:.2f} s ({args.workers} processus)")
+    print(f"Parties/s : {args.games / seconds:.2f}")
+    print(f"Coups/s   : {total_moves / seconds:.0f}")
+    for name in names + ('tie',):
+        print(f"{name:6} : {results[name] / args.games:6.1%} ({results[name]})")
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,178 @@
+import argparse
 import math
-import turtle 
-turtle.bgcolor("black")
-turtle.shape("turtle")
-turtle.speed(0)
-turtle.fillcolor("brown")
-Qi= 137.508 * (math.pi/180.0)
-for i in range(160+40):
-    r=4 * math.sqrt(i)
-    phi = i*Qi
-    x= r * math.cos(phi)
-    y= r* math.sin(phi)
-    turtle.penup()
-    turtle.goto(x,y)
-    turtle.setheading(i* 137.508)
-    turtle.pendown()
-    if i<160:
-        turtle.stamp() 
-    else :
-        turtle.fillcolor("yellow ")
-        turtle.begin_fill()
-        turtle.right(400)
-        turtle.forward(1700)
-        turtle.left(800)
-        turtle.forward(1700)
-        turtle.left(800)
-        turtle.forward(1700)
-        turtle.left(800)
-        turtle.forward(1700)
-        turtle.end_fill()
-turtle.hideturtle()
-    
\ No newline at end of file
+import struct
+import zlib
+
+import numpy as np
+
+DIVERGENCE = 137.508  # Angle d'or, en degrés
+SCALE = 4
+SEEDS = 160
+PETALS = 40
+PETAL_LENGTH = 1700
+BACKGROUND = (0, 0, 0)
+SEED_COLOR = (165, 42, 42)  # brown
+PETAL_COLOR = (255, 255, 0)  # yellow
+SEED_RADIUS = 4
+
+def phyllotaxis(count, divergence=DIVERGENCE, scale=SCALE):
+    # Positions (x, y) et orientations (degrés) des points i = 0 .. count - 1 : r = scale * sqrt(i)
+    i = np.arange(count, dtype=float)
+    r = scale * np.sqrt(i)
+    heading = i * divergence
+    phi = np.radians(heading)
+    return r * np.cos(phi), r * np.sin(phi), heading
+
+def petal_polygons(x, y, heading, length=PETAL_LENGTH):
+    # Sommets (n, 5, 2) du tracé de la tortue pour chaque pétale :
+    # right(400), forward, puis trois fois left(800), forward
+    turns = np.array([-400, 800, 800, 800], dtype=float)
+    angles = np.radians(heading[:, None] + np.cumsum(turns)[None, :])
+    steps = length * np.stack((np.cos(angles), np.sin(angles)), axis=2)
+    start = np.stack((x, y), axis=1)[:, None, :]
+    return np.concatenate((start, start + np.cumsum(steps, axis=1)), axis=1)
+
+def flower(seeds=SEEDS, petals=PETALS, divergence=DIVERGENCE, scale=SCALE):
+    # Les `seeds` premiers points sont des graines, les `petals` suivants des pétales
+    x, y, heading = phyllotaxis(seeds + petals, divergence, scale)
+    return (x[:seeds], y[:seeds]), petal_polygons(x[seeds:], y[seeds:], heading[seeds:])
+
+# -------------------- PNG (sans PIL) --------------------
+
+def fill_polygon(image, polygon, color):
+    # Remplissage pair-impair, vectorisé sur les pixels du rectangle englobant
+    height, width = image.shape[:2]
+    x0, y0 = np.floor(polygon.min(axis=0)).astype(int)
+    x1, y1 = np.ceil(polygon.max(axis=0)).astype(int)
+    x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width - 1), min(y1, height - 1)
+    if x0 > x1 or y0 > y1:
+        return
+    px, py = np.meshgrid(np.arange(x0, x1 + 1) + 0.5, np.arange(y0, y1 + 1) + 0.5)
+    inside = np.zeros(px.shape, dtype=bool)
+    for (ax, ay), (bx, by) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if ay == by:
+            continue
+        crosses = (ay > py) != (by > py)
+        inside ^= crosses & (px < ax + (py - ay) * (bx - ax) / (by - ay))
+    image[y0:y1 + 1, x0:x1 + 1][inside] = color
+
+def stamp_discs(image, px, py, radius, color):
+    # Un disque par point, tous dessinés ensemble décalage par décalage
+    height, width = image.shape[:2]
+    cx, cy = np.round(px).astype(int), np.round(py).astype(int)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dx * dx + dy * dy > radius * radius:
+                continue
+            x, y = cx + dx, cy + dy
+            keep = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+            image[y[keep], x[keep]] = color
+
+def write_png(path, image):
+    # PNG RGB 8 bits : IHDR, une seule IDAT compressée par zlib (filtre 0 par ligne), IEND
+    height, width = image.shape[:2]
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+def canvas_size(seeds_xy, margin=20):
+    # Carré assez grand pour contenir toutes les graines (centré sur l'origine)
+    x, y = seeds_xy
+    extent = float(np.max(np.hypot(x, y))) if len(x) else 0.0
+    return 2 * int(math.ceil(extent)) + 2 * margin
+
+def render_png(path, seeds_xy, petals, size=None, seed_radius=SEED_RADIUS):
+    size = size or canvas_size(seeds_xy)
+    image = np.empty((size, size, 3), dtype=np.uint8)
+    image[:] = BACKGROUND
+    centre = size / 2
+    # Repère de la tortue (y vers le haut) vers celui de l'image (y vers le bas)
+    for polygon in petals:
+        fill_polygon(image, np.column_stack((centre + polygon[:, 0], centre - polygon[:, 1])), PETAL_COLOR)
+    x, y = seeds_xy
+    stamp_discs(image, centre + x, centre - y, seed_radius, SEED_COLOR)
+    write_png(path, image)
+
+# -------------------- SVG --------------------
+
+def render_svg(path, seeds_xy, petals, size=None, seed_radius=SEED_RADIUS):
+    size = size or canvas_size(seeds_xy)
+    half = size / 2
+    hex_color = '#{:02x}{:02x}{:02x}'.format
+    with open(path, 'w') as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+                f'viewBox="{-half} {-half} {size} {size}">\n')
+        f.write(f'<rect x="{-half}" y="{-half}" width="{size}" height="{size}" fill="{hex_color(*BACKGROUND)}"/>\n')
+        # y inversé une fois pour tout le dessin, comme dans le repère de la tortue
+        f.write('<g transform="scale(1,-1)">\n')
+        f.write(f'<g fill="{hex_color(*PETAL_COLOR)}" fill-rule="evenodd">\n')
+        f.writelines('<polygon points="{}"/>\n'.format(' '.join(f'{px:.1f},{py:.1f}' for px, py in polygon))
+                     for polygon in petals)
+        f.write(f'</g>\n<g fill="{hex_color(*SEED_COLOR)}">\n')
+        x, y = seeds_xy
+        f.writelines(f'<circle cx="{px:.2f}" cy="{py:.2f}" r="{seed_radius}"/>\n' for px, py in zip(x, y))
+        f.write('</g>\n</g>\n</svg>\n')
+
+# -------------------- Aperçu tortue --------------------
+
+def preview(seeds=SEEDS, petals=PETALS, divergence=DIVERGENCE, scale=SCALE):
+    # Même dessin qu'avant, mais sans animation : tracer(0) puis un seul update() à la fin
+    import turtle
+    turtle.tracer(0)
+    turtle.bgcolor("black")
+    turtle.shape("turtle")
+    turtle.fillcolor("brown")
+    x, y, heading = phyllotaxis(seeds + petals, divergence, scale)
+    for i in range(seeds + petals):
+        turtle.penup()
+        turtle.goto(x[i], y[i])
+        turtle.setheading(heading[i])
+        turtle.pendown()
+        if i < seeds:
+            turtle.stamp()
+        else:
+            turtle.fillcolor("yellow")
+            turtle.begin_fill()
+            turtle.right(400)
+            turtle.forward(PETAL_LENGTH)
+            turtle.left(800)
+            turtle.forward(PETAL_LENGTH)
+            turtle.left(800)
+            turtle.forward(PETAL_LENGTH)
+            turtle.left(800)
+            turtle.forward(PETAL_LENGTH)
+            turtle.end_fill()
+    turtle.hideturtle()
+    turtle.update()
+    turtle.done()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleur en phyllotaxie (tortue, PNG ou SVG)")
+    parser.add_argument('--seeds', type=int, default=SEEDS)
+    parser.add_argument('--petals', type=int, default=PETALS)
+    parser.add_argument('--divergence', type=float, default=DIVERGENCE, help='angle entre deux points (degrés)')
+    parser.add_argument('--scale', type=float, default=SCALE)
+    parser.add_argument('--size', type=int, default=None, help='côté de l\'image (défaut : ajusté aux graines)')
+    parser.add_argument('--png', help='écrit une image PNG sans ouvrir de fenêtre')
+    parser.add_argument('--svg', help='écrit une image SVG sans ouvrir de fenêtre')
+    parser.add_argument('--preview', action='store_true', help='affiche la tortue (défaut sans --png/--svg)')
+    args = parser.parse_args()
+
+    seeds_xy, petals = flower(args.seeds, args.petals, args.divergence, args.scale)
+    if args.png:
+        render_png(args.png, seeds_xy, petals, args.size)
+    if args.svg:
+        render_svg(args.svg, seeds_xy, petals, args.size)
+    if args.preview or not (args.png or args.svg):
+        preview(args.seeds, args.petals, args.divergence, args.scale)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Profilage par phase des boucles de jeu pygame (entrées, mise à jour, collisions, IA, affichage).
+# Chaque image est chronométrée avec perf_counter_ns ; un panneau affichable avec F3 montre
+# les FPS, les temps d'image p50 / p99 et la part de chaque phase, et les mesures de toutes
+# les images peuvent être exportées en JSON ou en CSV à la fin de la partie.
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+import pygame
+
+import text_cache
+
+PHASES = ('input', 'update', 'collision', 'ai', 'draw')
+WINDOW = 120  # Images prises en compte par le panneau
+TOGGLE_KEY = pygame.K_F3
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, window=WINDOW, visible=False):
+        self.phases = phases
+        self.window = window
+        self.visible = visible
+        self.samples = []  # Une ligne par image : numéro, durée totale et durée de chaque phase (ns)
+        self.current = None
+        self.frame_start = None
+        self.overlay_rect = None
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+        self.current = dict.fromkeys(self.phases, 0)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter_ns() - start
+
+    def end_frame(self):
+        # La durée totale inclut l'attente de clock.tick, d'où la mesure des FPS réels
+        now = time.perf_counter_ns()
+        sample = {'frame': len(self.samples), 'total_ns': now - self.frame_start}
+        sample.update((f'{name}_ns', ns) for name, ns in self.current.items())
+        self.samples.append(sample)
+        self.frame_start = now
+        self.current = dict.fromkeys(self.phases, 0)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.visible = not self.visible
+
+    def summary(self):
+        recent = self.samples[-self.window:]
+        totals = [s['total_ns'] for s in recent]
+        elapsed = sum(totals)
+        return {
+            'fps': len(recent) * 1e9 / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(totals, 0.5) / 1e6,
+            'p99_ms': percentile(totals, 0.99) / 1e6,
+            'shares': {name: sum(s[f'{name}_ns'] for s in recent) / elapsed if elapsed else 0.0
+                       for name in self.phases},
+        }
+
+    def draw(self, surface, pos=(10, 10), background=None):
+        # Dessine le panneau et renvoie les rectangles modifiés ; `background` sert à effacer
+        # l'ancien panneau quand l'écran n'est pas entièrement redessiné à chaque image
+        dirty = []
+        if self.overlay_rect is not None and background is not None:
+            surface.blit(background, self.overlay_rect, self.overlay_rect)
+            dirty.append(self.overlay_rect)
+        self.overlay_rect = None
+        if not self.visible:
+            return dirty
+
+        stats = self.summary()
+        lines = [f"FPS {stats['fps']:.1f}",
+                 f"p50 {stats['p50_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms"]
+        lines += [f"{name:<9} {share:6.1%}" for name, share in stats['shares'].items()]
+        texts = [text_cache.render(line, (255, 255, 0), 20) for line in lines]
+        rect = pygame.Rect(pos, (max(t.get_width() for t in texts) + 10,
+                                 sum(t.get_height() for t in texts) + 10))
+        surface.fill((0, 0, 0), rect)
+        y = rect.y + 5
+        for text in texts:
+            surface.blit(text, (rect.x + 5, y))
+            y += text.get_height()
+        self.overlay_rect = rect
+        dirty.append(rect)
+        return dirty
+
+    def export(self, path):
+        # Format choisi d'après l'extension : .csv, sinon JSON
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['frame', 'total_ns'] + [f'{name}_ns' for name in self.phases])
+                writer.writeheader()
+                writer.writerows(self.samples)
+        else:
+            with open(path, 'w') as f:
+                json.dump({'phases': list(self.phases), 'summary': self.summary(), 'samples': self.samples}, f)
@@ -1,8 +1,10 @@
 import pygame
-import math
 import sys
 import random
-from pygame.math import Vector2
+import argparse
+import text_cache
+from frame_profiler import FrameProfiler
+from avoid_sim import IDLE, PLAYER_RADIUS, FixedTimestep, InputLog, Simulation
 
 # -------------------- Configuration Générale --------------------
 
@@ -12,179 +14,112 @@ FPS = 60
 # -------------------- Définition du Joueur --------------------
 
 class Player:
+    # Affichage et état du toucher ; le déplacement est calculé par la simulation (avoid_sim)
     def __init__(self):
-        self.radius = 15
+        self.radius = PLAYER_RADIUS
         self.color = (255, 255, 255)  # blanc
-        self.pos = Vector2(WIDTH / 2, HEIGHT - 50)
-        self.speed = 5  # Déplacement progressif
         self.moving = False  # État du toucher
 
     def handle_input(self, events):
+        # Renvoie l'entrée du pas : (bouton appuyé, cible x, cible y)
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN:
                 self.moving = True
             elif event.type == pygame.MOUSEBUTTONUP:
                 self.moving = False
-        
-        if self.moving:
-            target = Vector2(pygame.mouse.get_pos())
-            direction = target - self.pos
-            if direction.length() > self.speed:
-                direction = direction.normalize() * self.speed
-            self.pos += direction
+        x, y = pygame.mouse.get_pos()
+        return (self.moving, float(x), float(y))
 
-        # Empêcher de sortir de l'écran
-        self.pos.x = max(self.radius, min(WIDTH - self.radius, self.pos.x))
-        self.pos.y = max(self.radius, min(HEIGHT - self.radius, self.pos.y))
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
+    def draw(self, screen, pos):
+        pygame.draw.circle(screen, self.color, (int(pos[0]), int(pos[1])), self.radius)
 
 # -------------------- Définition des Obstacles --------------------
 
-class Obstacle:
-    def __init__(self, center, sides, radius, color, angular_velocity, base_speed):
-        self.center = Vector2(center)
-        self.sides = sides
-        self.radius = radius
-        self.color = color
-        self.rotation = 0.0
-        self.angular_velocity = angular_velocity
-        self.base_speed = base_speed  # Vitesse initiale
-        self.speed = base_speed  # Vitesse actuelle
-
-    def get_vertices(self):
-        return [
-            (
-                self.center.x + self.radius * math.cos(self.rotation + i * (2 * math.pi / self.sides)),
-                self.center.y + self.radius * math.sin(self.rotation + i * (2 * math.pi / self.sides))
-            ) for i in range(self.sides)
-        ]
-
-    def update(self):
-        self.center.x -= self.speed
-        self.rotation += self.angular_velocity
-        if self.center.x + self.radius < 0:
-            self.recycle()
-
-    def recycle(self):
-        self.center.x = WIDTH + self.radius
-        self.center.y = random.randint(self.radius, HEIGHT - self.radius)
-        self.speed = self.base_speed  # Réinitialiser la vitesse de l'obstacle
-
-    def draw(self, screen):
-        pygame.draw.polygon(screen, self.color, [(int(x), int(y)) for x, y in self.get_vertices()], 2)
-
-# -------------------- Gestion des Collisions --------------------
-
-def point_in_polygon(point, polygon):
-    x, y = point
-    inside = False
-    n = len(polygon)
-    p1x, p1y = polygon[0]
-    for i in range(n + 1):
-        p2x, p2y = polygon[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-    return inside
-
-def circle_polygon_collision(circle_center, circle_radius, polygon):
-    poly_center = sum((Vector2(x, y) for x, y in polygon), Vector2()) / len(polygon)
-    
-    if (circle_center - poly_center).length() > circle_radius + max(Vector2(x, y).length() for x, y in polygon):
-        return False  
-
-    return point_in_polygon((circle_center.x, circle_center.y), polygon) or any(
-        (circle_center - Vector2(x, y)).length() < circle_radius for x, y in polygon
-    )
-
-# -------------------- Score & Difficulté --------------------
-
-class Score:
-    def __init__(self):
-        self.start_time = pygame.time.get_ticks()
+def draw_field(screen, field):
+    # Dessine tout le champ d'obstacles à partir des sommets calculés une fois par image
+    for rows, points in field.vertices().values():
+        for color, polygon in zip(field.colors[rows].tolist(), points.astype(int).tolist()):
+            pygame.draw.polygon(screen, color, polygon, 2)
 
-    def get_score(self):
-        return (pygame.time.get_ticks() - self.start_time) // 1000  
+# -------------------- Score --------------------
 
-    def draw(self, screen):
-        font = pygame.font.SysFont(None, 36)
-        score_text = font.render(f"Score: {self.get_score()}", True, (255, 255, 255))
+class Score:
+    # Le score et la difficulté sont comptés en pas de simulation (voir avoid_sim)
+    def draw(self, screen, value):
+        score_text = text_cache.render(f"Score: {value}", (255, 255, 255), 36, sysfont=True)
         screen.blit(score_text, (10, 10))
 
-class DifficultyManager:
-    def __init__(self):
-        self.last_update_time = pygame.time.get_ticks()
-        self.multiplier = 1.0
-
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_update_time > 5000:  # Mise à jour toutes les 5 secondes
-            self.multiplier += 0.1  # Augmentation progressive
-            self.last_update_time = current_time
-
-    def get_multiplier(self):
-        return self.multiplier
-
 # -------------------- Boucle Principale --------------------
 
-def main():
+def main(bullet_hell=0, seed=None, record=None, replay=None, profile=None):
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Évitez les formes (Contrôle tactile)")
     clock = pygame.time.Clock()
 
+    # Rejeu : graine, mode et entrées viennent du fichier enregistré
+    if seed is None:
+        seed = random.randrange(2 ** 32)  # Graine tirée au hasard, mais enregistrée avec les entrées
+    log = InputLog.load(replay) if replay else InputLog(seed, bullet_hell)
+    commands = iter(log.commands) if replay else None
+    sim = Simulation(log.seed, log.bullet_hell, WIDTH, HEIGHT)  # Mode "bullet hell" : des milliers d'obstacles en tableaux NumPy
+    timestep = FixedTimestep(FPS)  # La physique avance par pas fixes, indépendamment de l'affichage
+
     player = Player()
     score = Score()
-    difficulty = DifficultyManager()
-
-    obstacles = [
-        Obstacle((WIDTH + 100, random.randint(50, HEIGHT - 50)), 3, 30, (255, 0, 0), 0.03, 3),
-        Obstacle((WIDTH + 300, random.randint(50, HEIGHT - 50)), 4, 40, (0, 255, 0), 0.02, 4),
-        Obstacle((WIDTH + 500, random.randint(50, HEIGHT - 50)), 5, 50, (0, 0, 255), 0.04, 2)
-    ]
-
-    game_over = False
-    font = pygame.font.SysFont(None, 48)
+    profiler = FrameProfiler(('input', 'update', 'collision', 'draw'))  # Panneau affiché avec F3
 
+    profiler.begin_frame()
     while True:
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-        if not game_over:
-            player.handle_input(events)
-            difficulty.update()  # Met à jour la difficulté
-
-            for obs in obstacles:
-                obs.speed = obs.base_speed * difficulty.get_multiplier()  # Applique la difficulté correctement
-                obs.update()
-                if circle_polygon_collision(player.pos, player.radius, obs.get_vertices()):
-                    game_over = True
-                    break
+        with profiler.phase('input'):
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    if record:
+                        log.save(record)
+                    if profile:
+                        profiler.export(profile)
+                    pygame.quit()
+                    sys.exit()
+                profiler.handle_event(event)
+            command = player.handle_input(events)
+
+        for _ in range(timestep.ticks()):
+            if sim.game_over:
+                break
+            if commands is not None:
+                command = next(commands, IDLE)
+            else:
+                log.record(command)
+            with profiler.phase('update'):
+                sim.advance(command)
+            with profiler.phase('collision'):
+                sim.collide()
 
         # Affichage
-        screen.fill((100, 0, 0) if game_over else (30, 30, 30))
-        player.draw(screen)
-        for obs in obstacles:
-            obs.draw(screen)
-        
-        if game_over:
-            text = font.render("GAME OVER", True, (255, 255, 255))
-            screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
-        else:
-            score.draw(screen)
-
-        pygame.display.flip()
+        with profiler.phase('draw'):
+            screen.fill((100, 0, 0) if sim.game_over else (30, 30, 30))
+            player.draw(screen, sim.player)
+            draw_field(screen, sim.obstacles)
+
+            if sim.game_over:
+                text = text_cache.render("GAME OVER", (255, 255, 255), 48, sysfont=True)
+                screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
+            else:
+                score.draw(screen, sim.score)
+            profiler.draw(screen, (10, HEIGHT - 150))
+
+            pygame.display.flip()
         clock.tick(FPS)
+        profiler.end_frame()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jeu d'évitement de formes")
+    parser.add_argument('--bullet-hell', type=int, default=0, metavar='N',
+                        help="nombre d'obstacles du mode bullet hell (0 : mode classique)")
+    parser.add_argument('--seed', type=int, default=None, help='graine de la partie')
+    parser.add_argument('--record', metavar='FICHIER', help='enregistre les entrées en JSON à la fermeture')
+    parser.add_argument('--replay', metavar='FICHIER', help='rejoue une partie enregistrée')
+    parser.add_argument('--profile', metavar='FICHIER', help='exporte les temps par image (.json ou .csv) à la fermeture')
+    args = parser.parse_args()
+    main(args.bullet_hell, args.seed, args.record, args.replay, args.profile)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# Cache disque des recherches du scraper, dans un seul fichier SQLite.
+# Chaque entrée garde la page HTML compressée, les lignes déjà extraites et les en-têtes
+# ETag / Last-Modified : une entrée encore fraîche (TTL) est servie sans réseau, une entrée
+# périmée est revalidée par une requête conditionnelle (304 : rien n'est retéléchargé).
+# Au-delà de la taille maximale, les entrées les moins récemment utilisées sont supprimées.
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+TTL = 24 * 3600  # Secondes
+MAX_BYTES = 100 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    html BLOB NOT NULL,
+    rows TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+def normalize(query, url=''):
+    # Même clé pour "Python  programming" et "python programming"
+    return url + '?' + ' '.join(query.lower().split())
+
+class Entry:
+    def __init__(self, key, html, rows, etag, last_modified, fetched, raw_size):
+        self.key = key
+        self.raw_size = raw_size  # Taille du HTML non compressé
+        self.compressed = html
+        self.rows = rows
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = fetched
+
+    @property
+    def html(self):
+        return zlib.decompress(self.compressed).decode('utf-8')
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched < ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ScrapeCache:
+    def __init__(self, path='scrape_cache.sqlite', ttl=TTL, max_bytes=MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Une connexion partagée par les threads de scrape_many, protégée par un verrou
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.hits = 0  # Servies sans réseau
+        self.revalidated = 0  # Réponses 304
+        self.misses = 0
+        self.stale = 0  # Entrées périmées servies car le serveur ne répondait pas (5xx)
+        self.bytes_saved = 0  # Octets de HTML non retéléchargés
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT html, rows, etag, last_modified, fetched, raw_size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        html, rows, etag, last_modified, fetched, raw_size = row
+        return Entry(key, html, json.loads(rows), etag, last_modified, fetched, raw_size)
+
+    def put(self, key, html, rows, etag=None, last_modified=None):
+        raw = html.encode('utf-8')
+        compressed = zlib.compress(raw)
+        rows = json.dumps(rows)
+        size = len(compressed) + len(rows)
+        now = time.time()
+        with self.lock:
+            if size > self.max_bytes:
+                # Trop gros pour le cache : on ne vide pas tout le cache pour lui, et une
+                # ancienne version de la page n'a plus lieu d'être gardée
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.db.commit()
+                return False
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, rows, etag, last_modified, now, now, size, len(raw)))
+            self.evict(keep=key)
+            self.db.commit()
+        return True
+
+    def refresh(self, entry, etag=None, last_modified=None):
+        # Réponse 304 : l'entrée redevient fraîche sans changer de contenu
+        with self.lock:
+            self.db.execute(
+                "UPDATE entries SET fetched = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), etag, last_modified, entry.key))
+            self.db.commit()
+
+    def count(self, outcome, saved=0):
+        # outcome : 'hits', 'revalidated', 'stale' ou 'misses' ; `saved` octets de HTML évités
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.bytes_saved += saved
+
+    def evict(self, keep=None):
+        # Supprime les entrées les moins récemment lues jusqu'à repasser sous max_bytes,
+        # sans jamais supprimer `keep` (l'entrée qui vient d'être écrite)
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute(
+                "SELECT key, size FROM entries WHERE key IS NOT ? ORDER BY accessed", (keep,)).fetchall():
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self.lock:
+            count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses,
+                'stale': self.stale, 'bytes_saved': self.bytes_saved, 'evictions': self.evictions,
+                'entries': count, 'size': size}
+
+    def close(self):
+        self.db.close()
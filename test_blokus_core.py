@@ -0,0 +1,61 @@
+# Tests des règles officielles de CornerBoard, comparées à une vérification case par case
+import random
+
+from blokus_core import BLUE, GREEN, RED, YELLOW, CornerBoard
+
+def cells(mask, size):
+    return [(bit % size, bit // size) for bit in range(size * size) if mask >> bit & 1]
+
+def touches_corner(board, color, mask):
+    # Une case de la pièce a une case de sa couleur en diagonale (ou couvre le coin de départ)
+    size = board.size
+    own = board.masks[color]
+    if not own:
+        return bool(mask & board.start[color])
+    for x, y in cells(mask, size):
+        for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < size and 0 <= ny < size and own >> (ny * size + nx) & 1:
+                return True
+    return False
+
+def touches_side(board, color, mask):
+    size = board.size
+    own = board.masks[color]
+    for x, y in cells(mask, size):
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < size and 0 <= ny < size and own >> (ny * size + nx) & 1:
+                return True
+    return False
+
+def check_moves(board, color):
+    table = board.tables[color]
+    for pid in board.moves(color):
+        mask = table.masks[pid]
+        assert not mask & board.occupied
+        assert touches_corner(board, color, mask), table.placements[pid][1:3]
+        assert not touches_side(board, color, mask)
+
+def test_bottom_right_corner_gives_no_anchor_on_opposite_corner():
+    board = CornerBoard()
+    size = board.size
+    for color in (BLUE, YELLOW, RED):
+        table = board.tables[color]
+        start = board.start[color].bit_length() - 1
+        board.make_move(color, table.index[(((0, 0),), start % size, start // size)])
+    green_start = board.start[GREEN]
+    assert not any(board.tables[RED].masks[pid] & green_start for pid in board.moves(RED))
+    assert not board.anchors(RED) & green_start
+    check_moves(board, RED)
+
+def test_random_games_only_generate_corner_moves():
+    rng = random.Random(7)
+    board = CornerBoard()
+    colors = list(board.masks)
+    for _ in range(40):
+        for color in colors:
+            check_moves(board, color)
+            moves = board.moves(color)
+            if moves:
+                board.make_move(color, rng.choice(sorted(moves)))
@@ -0,0 +1,221 @@
+# Tests du scraper contre un serveur HTTP local qui sert les pages de fixtures/wikipedia_search :
+# requêtes simultanées et bornées, limite de débit, nouvel essai après 503, délai d'attente,
+# cache (304, entrées périmées), pagination et analyseurs.
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from scrape_cache import ScrapeCache
+from web_scrapper import (available_parsers, make_session, parse_rows, scrape_many, scrape_pages,
+                          scrape_wikipedia, write_rows)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wikipedia_search')
+
+def fixture_name(query, offset):
+    # Les trois pages de "Python programming" ; toute autre recherche reçoit la première
+    if ' '.join(query.lower().split()) == 'python programming':
+        return f'python_programming_{offset}.html'
+    return 'python_programming_0.html'
+
+class FixtureServer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def reset(self):
+        with self.lock:
+            self.requests = []  # (chemin, recherche, décalage, en-têtes)
+            self.in_flight = 0
+            self.max_in_flight = 0
+        self.delay = 0.0  # Secondes avant chaque réponse
+        self.delays = {}  # Délai propre à certaines recherches
+        self.status = None  # Code d'erreur renvoyé à la place des pages, si défini
+        self.failed_once = set()
+
+    def url(self, path='/w/index.php'):
+        return f'http://127.0.0.1:{self.httpd.server_port}{path}'
+
+    def handle(self, handler):
+        parts = urlsplit(handler.path)
+        params = parse_qs(parts.query)
+        query = params.get('search', [''])[0]
+        offset = int(params.get('offset', ['0'])[0])
+        with self.lock:
+            self.requests.append((parts.path, query, offset, dict(handler.headers)))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(query, self.delay))
+            if self.status is not None:
+                return self.send(handler, self.status)
+            if parts.path.startswith('/flaky/') and query not in self.failed_once:
+                # Première requête d'une recherche : service indisponible, puis réponse normale
+                self.failed_once.add(query)
+                return self.send(handler, 503)
+            name = fixture_name(query, offset)
+            etag = f'"{name}-v1"'
+            if handler.headers.get('If-None-Match') == etag:
+                return self.send(handler, 304, headers={'ETag': etag})
+            with open(os.path.join(FIXTURES, name), 'rb') as f:
+                body = f.read()
+            self.send(handler, 200, body, {'ETag': etag, 'Content-Type': 'text/html; charset=UTF-8'})
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def send(handler, status, body=b'', headers=None):
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture(scope='module')
+def running_server():
+    server = FixtureServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def server(running_server):
+    running_server.reset()
+    return running_server
+
+# -------------------- Requêtes simultanées --------------------
+
+def test_scrape_many_runs_concurrently_with_bounded_in_flight(server):
+    server.delay = 0.2
+    queries = [f'query {i}' for i in range(12)]
+    start = time.perf_counter()
+    results = dict(scrape_many(queries, workers=4, rate=0, url=server.url()))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(results) == sorted(queries)
+    assert all(len(frame) == 20 for frame in results.values())
+    assert server.max_in_flight == 4
+    assert elapsed < 12 * 0.2 / 2  # Bien plus rapide qu'une requête après l'autre
+
+def test_scrape_many_yields_results_as_they_complete(server):
+    server.delays = {'slow': 0.6}
+    order = [query for query, _ in scrape_many(['slow', 'a', 'b', 'c'], workers=4, rate=0, url=server.url())]
+    assert order[-1] == 'slow'
+    assert sorted(order[:3]) == ['a', 'b', 'c']
+
+def test_scrape_many_reads_queries_lazily(server):
+    pulled = []
+
+    def queries():
+        for i in range(10_000):
+            pulled.append(i)
+            yield f'query {i}'
+
+    results = scrape_many(queries(), workers=3, rate=0, url=server.url())
+    next(results)
+    assert len(pulled) <= 4  # Fenêtre de `workers` requêtes, plus celle qui remplace la première finie
+    results.close()
+
+def test_rate_limit_spaces_requests_to_one_host(server):
+    start = time.perf_counter()
+    list(scrape_many([f'query {i}' for i in range(6)], workers=6, rate=10, url=server.url()))
+    assert time.perf_counter() - start >= 0.45  # 6 requêtes à 10 par seconde
+
+# -------------------- Nouvel essai et délai d'attente --------------------
+
+def test_retry_after_503(server):
+    results = scrape_wikipedia('retry me', make_session(1, retries=3, backoff=0), url=server.url('/flaky/index.php'))
+    assert len(results) == 20
+    assert [query for _, query, _, _ in server.requests] == ['retry me', 'retry me']
+
+def test_timeout_gives_empty_result(server):
+    server.delays = {'hang': 2.0}
+    start = time.perf_counter()
+    results = scrape_wikipedia('hang', make_session(1, retries=0), timeout=0.2, url=server.url())
+    assert results.empty
+    assert time.perf_counter() - start < 1.5
+
+# -------------------- Cache --------------------
+
+def test_fresh_entry_is_served_without_request(server, tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.sqlite'), ttl=3600)
+    first = scrape_wikipedia('Python programming', url=server.url(), cache=cache)
+    second = scrape_wikipedia('python  PROGRAMMING', url=server.url(), cache=cache)
+    assert second.values.tolist() == first.values.tolist()
+    assert len(server.requests) == 1
+    assert cache.stats()['hits'] == 1
+    cache.close()
+
+def test_stale_entry_is_revalidated_with_304(server, tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.sqlite'), ttl=0)
+    first = scrape_wikipedia('Python programming', url=server.url(), cache=cache)
+    second = scrape_wikipedia('Python programming', url=server.url(), cache=cache)
+    assert second.values.tolist() == first.values.tolist()
+    assert server.requests[1][3].get('If-None-Match') == '"python_programming_0.html-v1"'
+    stats = cache.stats()
+    assert (stats['misses'], stats['revalidated']) == (1, 1)
+    assert stats['bytes_saved'] > 0
+    cache.close()
+
+def test_stale_rows_are_served_when_revalidation_fails(server, tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.sqlite'), ttl=0)
+    session = make_session(1, retries=0)
+    first = scrape_wikipedia('Python programming', session, url=server.url(), cache=cache)
+    server.status = 503
+    second = scrape_wikipedia('Python programming', session, url=server.url(), cache=cache)
+    assert second.values.tolist() == first.values.tolist()
+    assert cache.stats()['stale'] == 1
+    cache.close()
+
+def test_oversize_entry_does_not_empty_the_cache(tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.sqlite'), max_bytes=600)
+    cache.put('small', 'x' * 100, [['a', 'b']])
+    assert not cache.put('big', os.urandom(2000).hex(), [])
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions']) == (1, 0)
+    assert cache.get('small') is not None
+    cache.close()
+
+# -------------------- Pagination et analyseurs --------------------
+
+def test_pagination_follows_next_link(server):
+    batches = list(scrape_pages('Python programming', url=server.url()))
+    assert [len(batch) for batch in batches] == [20, 20, 7]
+    assert [offset for _, _, offset, _ in server.requests] == [0, 20, 40]
+
+def test_pagination_stops_at_max_pages(server):
+    assert len(list(scrape_pages('Python programming', url=server.url(), max_pages=2))) == 2
+
+def test_write_rows_streams_every_page_to_csv(server, tmp_path):
+    path = str(tmp_path / 'rows.csv')
+    assert write_rows(scrape_pages('Python programming', url=server.url()), path) == 47
+    with open(path, encoding='utf-8') as f:
+        assert sum(1 for _ in f) == 48
+
+@pytest.mark.parametrize('parser', available_parsers())
+def test_parsers_keep_titles_paired_with_their_snippets(parser):
+    with open(os.path.join(FIXTURES, 'python_programming_40.html'), encoding='utf-8') as f:
+        rows = parse_rows(f.read(), parser)
+    assert len(rows) == 7
+    assert rows[1] == ('Python Server Pages', '')
+    assert rows[2][0] == 'Nuitka' and rows[2][1].startswith('Nuitka (pronounced')
@@ -0,0 +1,76 @@
+# Cache de texte partagé par les jeux pygame (Blokus, jeu d'évitement).
+# Les polices sont créées une seule fois par (nom, taille) et les surfaces rendues sont
+# gardées par (police, texte, couleur, anticrénelage) avec éviction LRU : un texte qui ne
+# change pas d'une image à l'autre n'est plus jamais re-rendu.
+from collections import OrderedDict
+
+import pygame
+
+MAX_SURFACES = 256
+
+class TextCache:
+    def __init__(self, max_surfaces=MAX_SURFACES):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.font_hits = 0
+        self.font_misses = 0
+        self.evictions = 0
+
+    def font(self, name=None, size=36, sysfont=False):
+        # sysfont=True passe par pygame.font.SysFont (recherche des polices système, lente)
+        key = (name, size, sysfont)
+        font = self.fonts.get(key)
+        if font is None:
+            self.font_misses += 1
+            font = pygame.font.SysFont(name, size) if sysfont else pygame.font.Font(name, size)
+            self.fonts[key] = font
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, text, color, size=36, name=None, antialias=True, sysfont=False):
+        key = (name, size, sysfont, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.font(name, size, sysfont).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'surfaces': len(self.surfaces),
+            'font_hits': self.font_hits,
+            'font_misses': self.font_misses,
+        }
+
+    def clear(self):
+        # À appeler après pygame.quit() : les polices ne sont plus valides
+        self.fonts.clear()
+        self.surfaces.clear()
+
+# Cache commun à tous les écrans
+shared = TextCache()
+
+def font(name=None, size=36, sysfont=False):
+    return shared.font(name, size, sysfont)
+
+def render(text, color, size=36, name=None, antialias=True, sysfont=False):
+    return shared.render(text, color, size, name, antialias, sysfont)
+
+def stats():
+    return shared.stats()
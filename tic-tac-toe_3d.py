@@ -1,40 +1,196 @@
 # 3D Tic-Tac-Toe using Ursina
 from ursina import *
+import argparse
+import math
+from tictactoe3d_core import Board3D, pick_cell
+from tictactoe3d_solver import Solver
+
+
+def box_geometry(scale, angle_z=0):
+    """Vertices and triangles of a box centred on the origin, rotated around z (degrees)."""
+    sx, sy, sz = (s / 2 for s in scale)
+    cos, sin = math.cos(math.radians(angle_z)), math.sin(math.radians(angle_z))
+    vertices = []
+    for x in (-sx, sx):
+        for y in (-sy, sy):
+            for z in (-sz, sz):
+                vertices.append((x * cos - y * sin, x * sin + y * cos, z))
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    triangles = [t for a, b, c, d in faces for t in ((a, b, c), (c, d, a))]
+    return vertices, triangles
+
+
+def sphere_geometry(radius, rings=8, segments=12):
+    """Vertices and triangles of a low-poly UV sphere."""
+    vertices = []
+    for ring in range(rings + 1):
+        phi = math.pi * ring / rings
+        for segment in range(segments):
+            theta = 2 * math.pi * segment / segments
+            vertices.append((radius * math.sin(phi) * math.cos(theta), radius * math.cos(phi),
+                             radius * math.sin(phi) * math.sin(theta)))
+    triangles = []
+    for ring in range(rings):
+        for segment in range(segments):
+            a = ring * segments + segment
+            b = ring * segments + (segment + 1) % segments
+            triangles += [(a, a + segments, b), (b, a + segments, b + segments)]
+    return vertices, triangles
+
+
+def x_geometry():
+    """The two crossed bars of an X marker as one shape."""
+    vertices, triangles = box_geometry((0.7, 0.1, 0.1), 45)
+    other_vertices, other_triangles = box_geometry((0.7, 0.1, 0.1), -45)
+    offset = len(vertices)
+    return vertices + other_vertices, triangles + [tuple(i + offset for i in t) for t in other_triangles]
+
+
+class MarkerPool:
+    """Recycles marker entities: reset hides them and the next round reuses them."""
+
+    def __init__(self):
+        """Start with no markers; they are created on demand."""
+        self.free = {1: [], 2: []}
+        self.active = []
+
+    def add(self, player, position):
+        """Show a marker for the player at the given position."""
+        if self.free[player]:
+            marker = self.free[player].pop()
+            marker.position = position
+            marker.enabled = True
+        else:
+            marker = self.create(player, position)
+        self.active.append((player, marker))
+
+    def create(self, player, position):
+        """Build a new marker entity (an X is a parent holding two bars)."""
+        if player == 1:
+            marker = Entity(position=position)
+            Entity(parent=marker, model='cube', color=color.red, scale=(0.7, 0.1, 0.1), rotation=Vec3(0,0,45))
+            Entity(parent=marker, model='cube', color=color.red, scale=(0.7, 0.1, 0.1), rotation=Vec3(0,0,-45))
+            return marker
+        return Entity(model='sphere', color=color.blue, scale=0.4, position=position)
+
+    def clear(self):
+        """Hide every active marker and keep it for later rounds."""
+        for player, marker in self.active:
+            marker.enabled = False
+            self.free[player].append(marker)
+        self.active.clear()
+
+
+class CombinedMarkers:
+    """Draws all markers of a player as a single mesh, i.e. one draw call per player."""
+
+    def __init__(self):
+        """Create one empty dynamic mesh per player."""
+        self.shapes = {1: x_geometry(), 2: sphere_geometry(0.2)}
+        self.entities = {
+            player: Entity(model=Mesh(vertices=[], triangles=[], mode='triangle', static=False),
+                           color=marker_color, double_sided=True)
+            for player, marker_color in ((1, color.red), (2, color.blue))
+        }
+
+    def add(self, player, position):
+        """Append a copy of the player's marker shape, moved to the given position."""
+        vertices, triangles = self.shapes[player]
+        mesh = self.entities[player].model
+        offset = len(mesh.vertices)
+        mesh.vertices += [Vec3(x, y, z) + position for x, y, z in vertices]
+        mesh.triangles += [tuple(i + offset for i in t) for t in triangles]
+        mesh.generate()
+
+    def clear(self):
+        """Empty both meshes."""
+        for entity in self.entities.values():
+            entity.model.vertices = []
+            entity.model.triangles = []
+            entity.model.generate()
+
 
 class TicTacToe3D(Entity):
     """3D Tic-Tac-Toe game using Ursina."""
 
-    def __init__(self, size=3):
-        """Initialize the game board and UI."""
+    def __init__(self, size=3, picking='buttons', markers='pool', computer=None, think_time=1.0):
+        """Initialize the game board and UI.
+
+        picking='buttons' gives every cell its own Button collider; picking='ray'
+        uses one collider around the whole cube and finds the cell by stepping
+        the mouse ray through the grid. markers='pool' recycles marker entities
+        across rounds; markers='combined' draws each player's markers as one mesh.
+        computer=1 or 2 lets the alpha-beta solver play that side, searching
+        for at most think_time seconds per move.
+        """
         super().__init__()
         self.size = size
+        self.picking = picking
         self.current_player = 1  # 1 for Player 1 (X), 2 for Player 2 (O)
         self.game_over = False
-        self.board = [[[0 for _ in range(size)] for _ in range(size)] for _ in range(size)]
+        self.board = Board3D(size)  # Flat cells plus per-line counters
         self.cells = {}  # Maps (i, j, k) to cell entity
-        self.markers = []  # Stores all placed markers for reset
+        self.cell_coords = {}  # Maps cell entity back to (i, j, k)
+        self.hovered = None  # Cell under the mouse in 'ray' picking mode
+        self.markers = CombinedMarkers() if markers == 'combined' else MarkerPool()  # Cleared on reset
         self.scores = {1: 0, 2: 0}  # Score tracking
+        self.computer = computer  # Player controlled by the solver, or None
+        self.think_time = think_time
+        self.solver = Solver(size) if computer else None
 
         self.create_board()
         self.create_ui()
+        if self.computer == 1:
+            invoke(self.computer_move, delay=0.1)
 
     def create_board(self):
         """Create the 3D grid and clickable cells."""
-        offset = Vec3(-1, -1, -1)  # Adjust position to center board
+        self.offset = Vec3(1, 1, 1) * -(self.size - 1) / 2  # Adjust position to center board
         for i in range(self.size):
             for j in range(self.size):
                 for k in range(self.size):
-                    pos = Vec3(i, j, k) + offset
-                    cell = Button(
-                        parent=scene,
-                        model='cube',
-                        color=color.white,
-                        position=pos,
-                        scale=0.9,
-                        highlight_color=color.lime,
-                        pressed_color=color.azure
-                    )
+                    pos = Vec3(i, j, k) + self.offset
+                    if self.picking == 'ray':
+                        cell = Entity(parent=scene, model='cube', color=color.white, position=pos, scale=0.9)
+                    else:
+                        cell = Button(
+                            parent=scene,
+                            model='cube',
+                            color=color.white,
+                            position=pos,
+                            scale=0.9,
+                            highlight_color=color.lime,
+                            pressed_color=color.azure
+                        )
                     self.cells[(i, j, k)] = cell
+                    self.cell_coords[cell] = (i, j, k)
+
+        if self.picking == 'ray':
+            # Single invisible collider around the whole board
+            self.bounds = Entity(parent=scene, model='cube', scale=self.size, collider='box', visible=False)
+
+    def pick(self):
+        """Return the cell under the mouse, or None."""
+        if self.picking != 'ray':
+            return self.cell_coords.get(mouse.hovered_entity)
+        if mouse.hovered_entity != self.bounds or mouse.world_point is None:
+            return None
+        origin = camera.world_position
+        direction = mouse.world_point - origin
+        return pick_cell(tuple(origin), tuple(direction), self.size, tuple(self.offset))
+
+    def update(self):
+        """Highlight the hovered cell in 'ray' picking mode."""
+        if self.picking != 'ray':
+            return
+        hovered = self.pick()
+        if hovered == self.hovered:
+            return
+        if self.hovered is not None and self.cells[self.hovered].color == color.lime:
+            self.cells[self.hovered].color = color.white
+        if hovered is not None and self.cells[hovered].color == color.white:
+            self.cells[hovered].color = color.lime
+        self.hovered = hovered
 
     def create_ui(self):
         """Create the UI elements (score and reset instructions)."""
@@ -52,42 +208,16 @@ class TicTacToe3D(Entity):
         )
 
     def check_winner(self, i, j, k):
-        """Dynamically check if the last move creates a winning condition."""
-        directions = [
-            [(1, 0, 0), (-1, 0, 0)],  # x-axis
-            [(0, 1, 0), (0, -1, 0)],  # y-axis
-            [(0, 0, 1), (0, 0, -1)],  # z-axis
-            [(1, 1, 0), (-1, -1, 0)],  # diagonal in xy-plane
-            [(1, -1, 0), (-1, 1, 0)],  # diagonal in xy-plane
-            [(1, 0, 1), (-1, 0, -1)],  # diagonal in xz-plane
-            [(1, 0, -1), (-1, 0, 1)],  # diagonal in xz-plane
-            [(0, 1, 1), (0, -1, -1)],  # diagonal in yz-plane
-            [(0, 1, -1), (0, -1, 1)],  # diagonal in yz-plane
-            [(1, 1, 1), (-1, -1, -1)],  # 3D diagonal
-            [(1, -1, 1), (-1, 1, -1)],  # 3D diagonal
-            [(1, 1, -1), (-1, -1, 1)],  # 3D diagonal
-            [(1, -1, -1), (-1, 1, 1)]   # 3D diagonal
-        ]
-
-        for direction in directions:
-            count = 1  # Start with current cell
-            cells_to_highlight = [(i, j, k)]
-
-            for dx, dy, dz in direction:
-                x, y, z = i, j, k
-                while 0 <= (x := x + dx) < self.size and 0 <= (y := y + dy) < self.size and 0 <= (z := z + dz) < self.size:
-                    if self.board[x][y][z] == self.current_player:
-                        count += 1
-                        cells_to_highlight.append((x, y, z))
-                    else:
-                        break
-
-            if count >= self.size:  # A player wins
+        """Check whether the last move wins, looking only at the lines through its cell."""
+        counts = self.board.counts[self.current_player]
+        for number in self.board.lines_through[self.board.index(i, j, k)]:
+            if counts[number] == self.size:  # A player wins
+                cells_to_highlight = [self.board.coords(cell) for cell in self.board.lines[number]]
                 self.highlight_winning_cells(cells_to_highlight)
                 return self.current_player
 
-        # Check for draw (if no empty spaces left)
-        if all(self.board[i][j][k] != 0 for i in range(self.size) for j in range(self.size) for k in range(self.size)):
+        # Check for draw (move counter reached the number of cells)
+        if self.board.is_full():
             print("It's a draw!")
             self.game_over = True
             return -1  # Indicates a draw
@@ -96,16 +226,7 @@ class TicTacToe3D(Entity):
 
     def draw_marker(self, i, j, k):
         """Place the marker for the current player."""
-        pos = self.cells[(i, j, k)].world_position
-
-        if self.current_player == 1:
-            marker = Entity(model='cube', color=color.red, scale=(0.7, 0.1, 0.1), position=pos, rotation=Vec3(0,0,45))
-            self.markers.append(marker)
-            marker2 = Entity(model='cube', color=color.red, scale=(0.7, 0.1, 0.1), position=pos, rotation=Vec3(0,0,-45))
-            self.markers.append(marker2)
-        else:
-            marker = Entity(model='sphere', color=color.blue, scale=0.4, position=pos)
-            self.markers.append(marker)
+        self.markers.add(self.current_player, self.cells[(i, j, k)].world_position)
 
     def highlight_winning_cells(self, cells):
         """Highlight the winning cells in yellow."""
@@ -121,42 +242,79 @@ class TicTacToe3D(Entity):
         if self.game_over:
             return
 
-        if key == 'left mouse down' and mouse.hovered_entity:
-            for coord, cell in self.cells.items():
-                if cell == mouse.hovered_entity:
-                    i, j, k = coord
-                    if self.board[i][j][k] == 0:
-                        self.board[i][j][k] = self.current_player
-                        self.draw_marker(i, j, k)
-                        winner = self.check_winner(i, j, k)
-
-                        if winner > 0:
-                            print(f"Player {winner} wins!")
-                            self.scores[winner] += 1
-                            self.score_text.text = f"Player 1: {self.scores[1]} - Player 2: {self.scores[2]}"
-                            self.game_over = True
-                        elif winner == -1:
-                            print("It's a draw!")  # Game ends in a draw
-                        else:
-                            self.current_player = 2 if self.current_player == 1 else 1
-                    break
+        if self.current_player == self.computer:
+            return  # Wait for the computer's move
+
+        coord = self.pick() if key == 'left mouse down' else None
+        if coord is not None and self.board.get(*coord) == 0:
+            self.play_move(*coord)
+
+    def play_move(self, i, j, k):
+        """Play the current player's marker at (i, j, k) and pass the turn."""
+        self.board.play(i, j, k, self.current_player)
+        self.draw_marker(i, j, k)
+        winner = self.check_winner(i, j, k)
+
+        if winner > 0:
+            print(f"Player {winner} wins!")
+            self.scores[winner] += 1
+            self.score_text.text = f"Player 1: {self.scores[1]} - Player 2: {self.scores[2]}"
+            self.game_over = True
+        elif winner == -1:
+            print("It's a draw!")  # Game ends in a draw
+        else:
+            self.current_player = 2 if self.current_player == 1 else 1
+            if self.current_player == self.computer:
+                invoke(self.computer_move, delay=0.1)  # Let the human's marker render first
+
+    def computer_move(self):
+        """Let the solver choose and play a move for the computer player."""
+        if self.game_over or self.current_player != self.computer:
+            return
+        coord = self.solver.choose(self.board, self.computer, self.think_time)
+        stats = self.solver.stats
+        print(f"Computer: depth {stats['depth']}, {stats['nodes']} nodes, "
+              f"{stats['nodes_per_sec']:.0f} nodes/s, TT hit rate {stats['hit_rate']:.0%}")
+        self.play_move(*coord)
+
+    def input(self, key):
+        """Forward Ursina key and mouse events to handle_input."""
+        self.handle_input(key)
 
     def reset_game(self):
         """Reset the game board and clear markers."""
         self.current_player = 1
         self.game_over = False
-        self.board = [[[0 for _ in range(self.size)] for _ in range(self.size)] for _ in range(self.size)]
+        self.board.reset()
 
         # Reset cell colors
         for cell in self.cells.values():
             cell.color = color.white
+        self.hovered = None
 
-        # Remove all markers
-        for marker in self.markers:
-            destroy(marker)
+        # Hide all markers (kept for reuse)
         self.markers.clear()
+        if self.solver is not None:
+            self.solver.clear()  # Positions of the previous game are not needed any more
+
+        if self.computer == 1:
+            invoke(self.computer_move, delay=0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description="3D Tic-Tac-Toe")
+    parser.add_argument('--size', type=int, default=3, help="cells per side")
+    parser.add_argument('--picking', choices=('buttons', 'ray'), default='buttons')
+    parser.add_argument('--markers', choices=('pool', 'combined'), default='pool')
+    parser.add_argument('--computer', type=int, choices=(1, 2), default=None,
+                        help="player controlled by the solver")
+    parser.add_argument('--think-time', type=float, default=1.0, help="seconds per computer move")
+    args = parser.parse_args()
+
+    # Initialize the game
+    app = Ursina()
+    game = TicTacToe3D(args.size, args.picking, args.markers, args.computer, args.think_time)
+    app.run()
+
 
-# Initialize the game
-app = Ursina()
-game = TicTacToe3D()
-app.run()       
+if __name__ == '__main__':
+    main()
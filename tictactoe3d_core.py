@@ -0,0 +1,168 @@
+# Headless rules for N x N x N Tic-Tac-Toe (no Ursina import)
+
+# The 13 line directions of a cube (one of each opposite pair)
+DIRECTIONS = [
+    (1, 0, 0), (0, 1, 0), (0, 0, 1),
+    (1, 1, 0), (1, -1, 0), (1, 0, 1), (1, 0, -1), (0, 1, 1), (0, 1, -1),
+    (1, 1, 1), (1, -1, 1), (1, 1, -1), (1, -1, -1)
+]
+
+_line_tables = {}
+
+
+def line_table(size):
+    """Return (lines, lines_through) for a board of the given size.
+
+    Cells are flat indices i * size * size + j * size + k. `lines` lists every
+    winning line as a tuple of cells and `lines_through[cell]` lists the line
+    numbers passing through that cell. Tables are built once per size.
+    """
+    if size in _line_tables:
+        return _line_tables[size]
+
+    def inside(i, j, k):
+        return 0 <= i < size and 0 <= j < size and 0 <= k < size
+
+    last = size - 1
+    lines = []
+    for di, dj, dk in DIRECTIONS:
+        for i in range(size):
+            for j in range(size):
+                for k in range(size):
+                    # A full line starts where the previous cell would fall off the board
+                    if inside(i - di, j - dj, k - dk):
+                        continue
+                    if not inside(i + last * di, j + last * dj, k + last * dk):
+                        continue
+                    lines.append(tuple(((i + n * di) * size + j + n * dj) * size + k + n * dk
+                                       for n in range(size)))
+
+    lines_through = [[] for _ in range(size ** 3)]
+    for number, line in enumerate(lines):
+        for cell in line:
+            lines_through[cell].append(number)
+
+    _line_tables[size] = (lines, [tuple(numbers) for numbers in lines_through])
+    return _line_tables[size]
+
+
+class Board3D:
+    """Board state with per-player counters on every winning line."""
+
+    def __init__(self, size=3):
+        """Build (or reuse) the line tables for this size and clear the board."""
+        self.size = size
+        self.lines, self.lines_through = line_table(size)
+        self.reset()
+
+    def reset(self):
+        """Empty every cell and counter."""
+        self.cells = [0] * self.size ** 3
+        self.counts = {1: [0] * len(self.lines), 2: [0] * len(self.lines)}
+        self.moves = 0
+
+    def index(self, i, j, k):
+        """Flat index of cell (i, j, k)."""
+        return (i * self.size + j) * self.size + k
+
+    def coords(self, cell):
+        """Cell (i, j, k) of a flat index."""
+        i, rest = divmod(cell, self.size * self.size)
+        return (i, *divmod(rest, self.size))
+
+    def get(self, i, j, k):
+        """Player occupying cell (i, j, k), or 0 if it is empty."""
+        return self.cells[self.index(i, j, k)]
+
+    def play(self, i, j, k, player):
+        """Place a marker and return the winning line it completes, or None.
+
+        Only the counters of the lines through (i, j, k) are updated.
+        """
+        cell = self.index(i, j, k)
+        self.cells[cell] = player
+        self.moves += 1
+        counts = self.counts[player]
+        winning = None
+        for number in self.lines_through[cell]:
+            counts[number] += 1
+            if counts[number] == self.size:
+                winning = self.lines[number]
+        return winning
+
+    def undo(self, i, j, k):
+        """Remove the marker from cell (i, j, k)."""
+        cell = self.index(i, j, k)
+        counts = self.counts[self.cells[cell]]
+        for number in self.lines_through[cell]:
+            counts[number] -= 1
+        self.cells[cell] = 0
+        self.moves -= 1
+
+    def is_full(self):
+        """True once every cell holds a marker."""
+        return self.moves == len(self.cells)
+
+
+def _ray_box(origin, direction, lo, hi):
+    """Entry and exit distances of a ray through an axis-aligned box, or None if it misses."""
+    t_enter, t_exit = float('-inf'), float('inf')
+    for o, d, a, b in zip(origin, direction, lo, hi):
+        if d == 0:
+            if not a <= o <= b:
+                return None
+            continue
+        t0, t1 = (a - o) / d, (b - o) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+    if t_enter > t_exit or t_exit < 0:
+        return None
+    return t_enter, t_exit
+
+
+def pick_cell(origin, direction, size, offset=None, scale=0.9):
+    """Return the first cell (i, j, k) whose cube the ray hits, or None.
+
+    Cell (i, j, k) is a unit voxel centred on (i, j, k) + offset; `offset`
+    defaults to centring the board on the origin. Only the inner cube of
+    side `scale` counts as a hit, like the cell models, so the gaps between
+    cells stay see-through. The ray is stepped voxel by voxel (3D-DDA), so
+    the cost grows with `size`, not with the number of cells.
+    """
+    if offset is None:
+        offset = (-(size - 1) / 2,) * 3
+    lo = [c - 0.5 for c in offset]
+    hit = _ray_box(origin, direction, lo, [c + size for c in lo])
+    if hit is None:
+        return None
+
+    # Voxel where the ray enters the grid
+    t = max(hit[0], 0.0)
+    cell, step, t_max, t_delta = [], [], [], []
+    for o, d, a in zip(origin, direction, lo):
+        index = min(max(int((o + t * d - a) // 1), 0), size - 1)
+        cell.append(index)
+        if d > 0:
+            step.append(1)
+            t_max.append((a + index + 1 - o) / d)
+            t_delta.append(1 / d)
+        elif d < 0:
+            step.append(-1)
+            t_max.append((a + index - o) / d)
+            t_delta.append(-1 / d)
+        else:
+            step.append(0)
+            t_max.append(float('inf'))
+            t_delta.append(float('inf'))
+
+    half = scale / 2
+    while True:
+        centre = [a + 0.5 + c for a, c in zip(lo, cell)]
+        if _ray_box(origin, direction, [c - half for c in centre], [c + half for c in centre]):
+            return tuple(cell)
+        axis = t_max.index(min(t_max))
+        cell[axis] += step[axis]
+        if not 0 <= cell[axis] < size:
+            return None
+        t_max[axis] += t_delta[axis]
@@ -0,0 +1,254 @@
+# Headless computer player for N x N x N Tic-Tac-Toe
+import time
+from itertools import permutations, product
+
+from tictactoe3d_core import line_table
+
+WIN = 1_000_000  # Score of a won position (minus the plies needed to win)
+MATE = WIN - 10_000  # Scores beyond this are forced wins or losses
+TT_SIZE = 1 << 20  # Transposition table entries kept at most
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+def cube_symmetries(size):
+    """Cell permutations for the 48 symmetries of the cube (axis swaps and reflections)."""
+    cells = list(product(range(size), repeat=3))
+    symmetries = []
+    for axes in permutations(range(3)):
+        for flips in product((False, True), repeat=3):
+            perm = []
+            for cell in cells:
+                moved = [size - 1 - cell[a] if flip else cell[a] for a, flip in zip(axes, flips)]
+                perm.append((moved[0] * size + moved[1]) * size + moved[2])
+            symmetries.append(perm)
+    return symmetries
+
+
+class Solver:
+    """Iterative-deepening alpha-beta search on two bitmasks (one per player).
+
+    Positions are stored in a transposition table under their canonical form,
+    the smallest of their 48 cube symmetries. Moves are ordered by the threat
+    counts of the winning lines through each cell.
+    """
+
+    def __init__(self, size=3, tt_size=TT_SIZE):
+        """Precompute line masks and symmetry lookup tables for this size."""
+        self.size = size
+        self.tt_size = tt_size
+        self.cell_count = size ** 3
+        self.full = (1 << self.cell_count) - 1
+        lines, lines_through = line_table(size)
+        self.lines = [sum(1 << cell for cell in line) for line in lines]
+        self.lines_through = lines_through
+        # Value of a line holding n markers of one player only
+        self.weights = [0] + [4 ** n for n in range(1, size + 1)]
+
+        # Applying a symmetry to a mask, one byte at a time: tables[s][chunk][byte] -> permuted bits
+        self.symmetries = cube_symmetries(size)
+        self.inverse = []
+        self.tables = []
+        chunks = (self.cell_count + 7) // 8
+        for perm in self.symmetries:
+            inverse = [0] * self.cell_count
+            for cell, moved in enumerate(perm):
+                inverse[moved] = cell
+            self.inverse.append(inverse)
+            table = []
+            for chunk in range(chunks):
+                row = [0] * 256
+                for byte in range(256):
+                    bits = 0
+                    for bit in range(8):
+                        cell = chunk * 8 + bit
+                        if byte >> bit & 1 and cell < self.cell_count:
+                            bits |= 1 << perm[cell]
+                    row[byte] = bits
+                table.append(row)
+            self.tables.append(table)
+
+        self.tt = {}
+        self.stats = {}
+
+    def transform(self, mask, symmetry):
+        """Apply one of the 48 symmetries to a mask."""
+        result = 0
+        for row in self.tables[symmetry]:
+            result |= row[mask & 255]
+            mask >>= 8
+        return result
+
+    def canonical(self, me, opp):
+        """Smallest symmetric image of the position, and the symmetry that produces it."""
+        best, best_symmetry = None, 0
+        for symmetry in range(len(self.tables)):
+            key = (self.transform(me, symmetry), self.transform(opp, symmetry))
+            if best is None or key < best:
+                best, best_symmetry = key, symmetry
+        return best, best_symmetry
+
+    def clear(self):
+        """Forget the transposition table (e.g. between games)."""
+        self.tt.clear()
+
+    def choose(self, board, player, time_limit=1.0):
+        """Best move (i, j, k) for `player` on a Board3D within `time_limit` seconds."""
+        me = opp = 0
+        for cell, owner in enumerate(board.cells):
+            if owner == player:
+                me |= 1 << cell
+            elif owner:
+                opp |= 1 << cell
+        cell = self.search(me, opp, time_limit)
+        return None if cell is None else board.coords(cell)
+
+    def search(self, me, opp, time_limit=1.0):
+        """Iterative deepening from the position where `me` is to move; returns a cell index."""
+        self.nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.deadline = time.perf_counter() + time_limit
+        if len(self.tt) >= self.tt_size:
+            self.clear()  # Full after earlier searches: start this one afresh
+        start = time.perf_counter()
+        empty = self.full & ~(me | opp)
+        best, value, depth = None, 0, 0
+        if empty:
+            best = (empty & -empty).bit_length() - 1
+        try:
+            for depth in range(1, empty.bit_count() + 1):
+                value = self.negamax(me, opp, depth, -WIN, WIN, 0)
+                best = self.root_move
+                if abs(value) > MATE:
+                    break  # Solved: forced win or loss
+        except _Timeout:
+            depth -= 1
+        seconds = time.perf_counter() - start
+        self.stats = {
+            'depth': depth,
+            'value': value,
+            'nodes': self.nodes,
+            'seconds': seconds,
+            'nodes_per_sec': self.nodes / seconds if seconds else 0.0,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'hit_rate': self.tt_hits / self.tt_probes if self.tt_probes else 0.0,
+        }
+        return best
+
+    def negamax(self, me, opp, depth, alpha, beta, ply):
+        """Alpha-beta value of the position for the side to move (`me`)."""
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        empty = self.full & ~(me | opp)
+        if not empty:
+            return 0
+
+        # One pass over the lines: immediate wins, forced blocks and line values
+        threat = self.size - 1
+        values = []
+        win = blocks = 0
+        score = 0
+        for line in self.lines:
+            mine, theirs = me & line, opp & line
+            if not theirs:
+                n = mine.bit_count()
+                if n == threat:
+                    win = line & ~mine
+                values.append(self.weights[n] if n else 1)
+                score += self.weights[n]
+            elif not mine:
+                n = theirs.bit_count()
+                if n == threat:
+                    blocks |= line & ~theirs
+                values.append(self.weights[n])
+                score -= self.weights[n]
+            else:
+                values.append(0)
+
+        if win:
+            if ply == 0:
+                self.root_move = win.bit_length() - 1
+            return WIN - ply - 1
+        if blocks & (blocks - 1):
+            # Two different threats: only one can be blocked
+            if ply == 0:
+                self.root_move = blocks.bit_length() - 1
+            return -(WIN - ply - 2)
+        if depth == 0:
+            return score
+
+        # Transposition table, keyed by the canonical form of the position
+        alpha_start = alpha
+        key, symmetry = self.canonical(me, opp)
+        self.tt_probes += 1
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            self.tt_hits += 1
+            entry_depth, entry_value, flag, canonical_move = entry
+            tt_move = self.inverse[symmetry][canonical_move]
+            if entry_depth >= depth and ply > 0:
+                entry_value = self.from_tt(entry_value, ply)
+                if flag == 0:
+                    return entry_value
+                if flag < 0:
+                    beta = min(beta, entry_value)
+                else:
+                    alpha = max(alpha, entry_value)
+                if alpha >= beta:
+                    return entry_value
+
+        # Move ordering: forced block only, otherwise table move then threat counts
+        candidates = blocks if blocks else empty
+        moves = []
+        while candidates:
+            low = candidates & -candidates
+            cell = low.bit_length() - 1
+            moves.append((sum(values[number] for number in self.lines_through[cell]), cell))
+            candidates ^= low
+        moves.sort(reverse=True)
+        order = [cell for _, cell in moves]
+        if tt_move in order:
+            order.remove(tt_move)
+            order.insert(0, tt_move)
+
+        best_value, best_move = -WIN, order[0]
+        for cell in order:
+            value = -self.negamax(opp, me | 1 << cell, depth - 1, -beta, -alpha, ply + 1)
+            if value > best_value:
+                best_value, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = 1 if best_value >= beta else -1 if best_value <= alpha_start else 0
+        if key in self.tt or len(self.tt) < self.tt_size:
+            self.tt[key] = (depth, self.to_tt(best_value, ply), flag,
+                            self.symmetries[symmetry][best_move])
+        if ply == 0:
+            self.root_move = best_move
+        return best_value
+
+    @staticmethod
+    def to_tt(value, ply):
+        """Store win/loss scores relative to the node, not the root."""
+        if value > MATE:
+            return value + ply
+        if value < -MATE:
+            return value - ply
+        return value
+
+    @staticmethod
+    def from_tt(value, ply):
+        """Inverse of to_tt for the node at `ply`."""
+        if value > MATE:
+            return value - ply
+        if value < -MATE:
+            return value + ply
+        return value
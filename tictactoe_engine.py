@@ -0,0 +1,249 @@
+# Bitmask engine for m,n,k Tic-Tac-Toe (no tkinter import)
+import os
+import time
+
+WIN = 1000  # Score of a won position (minus the plies needed to win)
+MATE = WIN - 100  # Scores beyond this are forced wins or losses
+TABLE_SIZE = 3 ** 9  # One entry per 3x3 position, indexed in base 3
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+def win_masks(rows, cols, k):
+    """Bitmasks of every run of k cells in a row, column or diagonal (bit r * cols + c)."""
+    masks = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + (k - 1) * dr, c + (k - 1) * dc
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    masks.append(sum(1 << ((r + n * dr) * cols + c + n * dc) for n in range(k)))
+    return masks
+
+
+class Engine:
+    """Bitmask m,n,k engine: each player is a mask over the rows * cols cells.
+
+    The 3x3 game is served from a perfect-play table (built once, or loaded
+    from disk). Larger boards use memoized alpha-beta with iterative
+    deepening; positions solved within the time limit are played perfectly.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, table_path=None):
+        """Precompute win masks; `table_path` caches the 3x3 table on disk."""
+        self.rows, self.cols, self.k = rows, cols, k
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        self.lines = win_masks(rows, cols, k)
+        self.lines_through = [[line for line in self.lines if line >> cell & 1] for cell in range(self.cells)]
+        # Centre cells first: they belong to the most lines
+        self.order = sorted(range(self.cells), key=lambda cell: -len(self.lines_through[cell]))
+        self.memo = {}
+        self.table = None
+        self.stats = {}
+        if (rows, cols, k) == (3, 3, 3):
+            self.table = PerfectTable.load_or_build(self, table_path)
+
+    def is_win(self, mask):
+        """True if the mask covers a complete line."""
+        return any(mask & line == line for line in self.lines)
+
+    def wins_at(self, mask, cell):
+        """True if the mask has a complete line through `cell` (the last move)."""
+        return any(mask & line == line for line in self.lines_through[cell])
+
+    def best_move(self, me, opp, time_limit=1.0, stop=None):
+        """Best cell for the side to move (`me`), or None on a full board.
+
+        `stop` is an optional threading.Event that aborts the search early.
+        """
+        if not self.full & ~(me | opp):
+            return None
+        if self.table is not None:
+            return self.table.best_move(me, opp)
+        return self.search(me, opp, time_limit, stop)
+
+    def ponder(self, me, opp, time_limit=0.5, stop=None):
+        """While `me` (the human) thinks, search the replies to each of their moves.
+
+        Nothing is returned: the results stay in the memo table, so the real
+        search after the human's move starts from them. Runs until every
+        reply is searched or `stop` is set.
+        """
+        if self.table is not None:
+            return  # Table lookups need no pondering
+        empty = self.full & ~(me | opp)
+        for cell in self.order:
+            if stop is not None and stop.is_set():
+                return
+            if empty >> cell & 1 and not self.wins_at(me | 1 << cell, cell):
+                self.search(opp, me | 1 << cell, time_limit, stop)
+
+    def search(self, me, opp, time_limit=1.0, stop=None):
+        """Iterative-deepening alpha-beta on the memo table; returns a cell."""
+        self.nodes = 0
+        self.deadline = time.perf_counter() + time_limit
+        self.stop = stop
+        start = time.perf_counter()
+        empties = (self.full & ~(me | opp)).bit_count()
+        best, value, depth = next(c for c in self.order if not (me | opp) >> c & 1), 0, 0
+        try:
+            for depth in range(1, empties + 1):
+                value, move = self.negamax(me, opp, depth, -WIN, WIN)
+                best = move
+                if abs(value) > MATE:
+                    break  # Solved: forced win or loss
+        except _Timeout:
+            depth -= 1
+        self.stats = {'depth': depth, 'value': value, 'nodes': self.nodes,
+                      'seconds': time.perf_counter() - start, 'solved': depth == empties or abs(value) > MATE}
+        return best
+
+    def negamax(self, me, opp, depth, alpha, beta):
+        """(value, move) for the side to move; the opponent's last move did not win."""
+        self.nodes += 1
+        if not self.nodes & 1023 and (time.perf_counter() > self.deadline
+                                      or self.stop is not None and self.stop.is_set()):
+            raise _Timeout
+        empty = self.full & ~(me | opp)
+        if not empty:
+            return 0, None
+
+        key = (me, opp)
+        entry = self.memo.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, entry_value, flag, first = entry
+            # Exact scores of solved positions hold at any depth
+            if entry_depth >= depth or abs(entry_value) > MATE:
+                if flag == 0 or (flag > 0 and entry_value >= beta) or (flag < 0 and entry_value <= alpha):
+                    return entry_value, first
+
+        moves = [cell for cell in self.order if empty >> cell & 1]
+        for cell in moves:
+            if self.wins_at(me | 1 << cell, cell):
+                self.memo[key] = (depth, WIN - 1, 0, cell)
+                return WIN - 1, cell
+        if depth == 1:
+            value = self.evaluate(me, opp)
+            return value, moves[0] if first is None else first
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+
+        alpha_start = alpha
+        best_value, best_move = -WIN, moves[0]
+        for cell in moves:
+            value, _ = self.negamax(opp, me | 1 << cell, depth - 1, -beta, -alpha)
+            value = -value
+            # A win further away is worth slightly less
+            value -= 1 if value > MATE else -1 if value < -MATE else 0
+            if value > best_value:
+                best_value, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = 1 if best_value >= beta else -1 if best_value <= alpha_start else 0
+        self.memo[key] = (depth, best_value, flag, best_move)
+        return best_value, best_move
+
+    def evaluate(self, me, opp):
+        """Heuristic at the search horizon: lines still open to each side."""
+        score = 0
+        for line in self.lines:
+            if not line & opp:
+                score += (line & me).bit_count() ** 2 + 1
+            if not line & me:
+                score -= (line & opp).bit_count() ** 2 + 1
+        return max(-MATE, min(MATE, score))
+
+
+class PerfectTable:
+    """Minimax value and best move of every reachable 3x3 position.
+
+    Positions are indexed in base 3 (cell value 0 empty, 1 side to move,
+    2 opponent); each byte holds the value (0 loss, 1 draw, 2 win) times
+    16 plus the best cell, so the whole table is 19683 bytes on disk.
+    """
+
+    def __init__(self, data):
+        """Wrap the raw table bytes."""
+        self.data = data
+        # Base-3 weight of every 9-bit mask, for O(1) indexing
+        self.base3 = [sum(3 ** cell for cell in range(9) if mask >> cell & 1) for mask in range(512)]
+
+    def index(self, me, opp):
+        """Table index of a position."""
+        return self.base3[me] + 2 * self.base3[opp]
+
+    def best_move(self, me, opp):
+        """Best cell for the side to move."""
+        return self.data[self.index(me, opp)] & 15
+
+    def value(self, me, opp):
+        """-1, 0 or 1 for the side to move under perfect play."""
+        return (self.data[self.index(me, opp)] >> 4) - 1
+
+    @classmethod
+    def build(cls, engine):
+        """Solve every position reachable from the empty board."""
+        data = bytearray(TABLE_SIZE)
+        table = cls(data)
+        scores = {}
+
+        def solve(me, opp):
+            # Score for the side to move: > 0 win (sooner is larger), 0 draw, < 0 loss
+            key = (me, opp)
+            if key in scores:
+                return scores[key]
+            best_score, best_cell = None, 0
+            for cell in engine.order:
+                if (me | opp) >> cell & 1:
+                    continue
+                mine = me | 1 << cell
+                if engine.wins_at(mine, cell):
+                    score = 10
+                elif mine | opp == engine.full:
+                    score = 0
+                else:
+                    score = -solve(opp, mine)
+                    score -= (score > 0) - (score < 0)
+                if best_score is None or score > best_score:
+                    best_score, best_cell = score, cell
+            scores[key] = best_score
+            data[table.index(me, opp)] = ((best_score > 0) - (best_score < 0) + 1) * 16 + best_cell
+            return best_score
+
+        solve(0, 0)
+        return table
+
+    def save(self, path):
+        """Write the raw table."""
+        with open(path, 'wb') as f:
+            f.write(self.data)
+
+    @classmethod
+    def load_or_build(cls, engine, path=None):
+        """Load the table from `path` if present, otherwise build it (and try to save it there).
+
+        An unreadable or unwritable path is not an error: the table is then
+        simply rebuilt in memory (a fraction of a second) on every start.
+        """
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = b''
+            if len(data) == TABLE_SIZE:
+                return cls(data)
+        table = cls.build(engine)
+        if path:
+            try:
+                table.save(path)
+            except OSError:
+                pass  # e.g. read-only install directory: keep the in-memory table
+        return table
@@ -1,35 +1,65 @@
+import os
+import sys
 import tkinter as tk
-import random
+from tictactoe_engine import Engine
+from ai_executor import AIExecutor
+
+# Perfect-play table for the 3x3 game, built on first run and then loaded
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_table.bin")
+MIN_THINK_TIME = 0.5  # The computer's move is shown no sooner than this, however fast the search
+SEARCH_TIME = 1.0  # Search budget on boards larger than 3x3
 
 class TicTacToe:
-    def __init__(self, master):
+    def __init__(self, master, rows=3, cols=3, k=3):
         self.master = master
-        self.master.title("Tic-Tac-Toe")
+        self.master.title("Tic-Tac-Toe" if (rows, cols, k) == (3, 3, 3) else f"Tic-Tac-Toe {rows}x{cols}, {k} in a row")
+        self.rows, self.cols = rows, cols
 
         # Initialize the board and symbols
-        self.board = [" "] * 9
+        self.board = [" "] * (rows * cols)
         self.player_symbol = "X"
         self.computer_symbol = "O"
         self.game_over = False
+        self.thinking = False
+
+        # Bitmask engine: one mask per symbol, perfect-play table on 3x3
+        self.engine = Engine(rows, cols, k, TABLE_PATH)
+        self.masks = {self.player_symbol: 0, self.computer_symbol: 0}
+
+        # Searches run on a background thread so the window never freezes
+        self.ai = AIExecutor(self.master)
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
 
         # Create a status label
         self.status_label = tk.Label(self.master, text="Your turn (X)")
-        self.status_label.grid(row=0, column=0, columnspan=3, pady=5)
+        self.status_label.grid(row=0, column=0, columnspan=cols, pady=5)
 
-        # Create the 3x3 buttons for the board
+        # Create the buttons for the board
         self.buttons = []
-        for i in range(9):
+        for i in range(rows * cols):
             btn = tk.Button(self.master, text=" ", font=("Helvetica", 20), width=5, height=2,
                             command=lambda index=i: self.player_move(index))
-            btn.grid(row=(i // 3) + 1, column=i % 3, padx=5, pady=5)
+            btn.grid(row=(i // cols) + 1, column=i % cols, padx=5, pady=5)
             self.buttons.append(btn)
 
+        # New game button (also cancels a search in progress)
+        self.reset_button = tk.Button(self.master, text="New game", command=self.reset)
+        self.reset_button.grid(row=rows + 1, column=0, columnspan=cols, pady=5)
+        self.ponder()
+
+    def play(self, index, symbol):
+        """
+        Places the symbol on the board and in its mask.
+        """
+        self.board[index] = symbol
+        self.masks[symbol] |= 1 << index
+
     def player_move(self, index):
         """
         Handles the player's move if the game isn't over and if the chosen cell is empty.
         """
-        if not self.game_over and self.board[index] == " ":
-            self.board[index] = self.player_symbol
+        if not self.game_over and not self.thinking and self.board[index] == " ":
+            self.play(index, self.player_symbol)
             self.update_buttons()
             if self.check_win(self.player_symbol):
                 self.status_label.config(text="You win! Congratulations!")
@@ -41,49 +71,31 @@ class TicTacToe:
                 return
 
             self.status_label.config(text="Computer is thinking...")
-            self.master.after(500, self.computer_move)  # Wait half a second for effect
+            self.thinking = True
+            self.ai.cancel()  # Stop pondering; its results stay in the engine's memo table
+            self.ai.submit(self.engine.best_move, self.masks[self.computer_symbol],
+                           self.masks[self.player_symbol], SEARCH_TIME,
+                           callback=self.computer_move, errback=self.computer_failed,
+                           min_delay=MIN_THINK_TIME)
+
+    def ponder(self):
+        """
+        Searches the computer's replies in the background while the player thinks.
+        """
+        self.ai.submit(self.engine.ponder, self.masks[self.player_symbol], self.masks[self.computer_symbol])
 
-    def computer_move(self):
+    def computer_move(self, move):
         """
-        Basic computer strategy:
-        1. Check if the computer can win on this move.
-        2. Block the player's winning move if possible.
-        3. Otherwise, choose a random empty spot.
+        Plays the move found by the engine (called on the Tk thread once the
+        background search is done): a table lookup on 3x3, a memoized
+        alpha-beta search on larger boards.
         """
+        self.thinking = False
         if self.game_over:
             return
 
-        # 1. Check for a winning move
-        for i in range(9):
-            if self.board[i] == " ":
-                self.board[i] = self.computer_symbol
-                if self.check_win(self.computer_symbol):
-                    self.update_buttons()
-                    self.status_label.config(text="Computer wins! Better luck next time.")
-                    self.game_over = True
-                    return
-                else:
-                    self.board[i] = " "
-
-        # 2. Block player's winning move
-        for i in range(9):
-            if self.board[i] == " ":
-                self.board[i] = self.player_symbol
-                if self.check_win(self.player_symbol):
-                    self.board[i] = self.computer_symbol
-                    self.update_buttons()
-                    if self.check_win(self.computer_symbol):
-                        self.status_label.config(text="Computer wins! Better luck next time.")
-                        self.game_over = True
-                    return
-                else:
-                    self.board[i] = " "
-
-        # 3. Otherwise, pick a random available cell
-        available_moves = [i for i, v in enumerate(self.board) if v == " "]
-        if available_moves:
-            move = random.choice(available_moves)
-            self.board[move] = self.computer_symbol
+        if move is not None:
+            self.play(move, self.computer_symbol)
             self.update_buttons()
             if self.check_win(self.computer_symbol):
                 self.status_label.config(text="Computer wins! Better luck next time.")
@@ -96,20 +108,42 @@ class TicTacToe:
 
         if not self.game_over:
             self.status_label.config(text="Your turn (X)")
+            self.ponder()
+
+    def computer_failed(self, error):
+        """
+        Unlocks the board when the background search raised (the traceback is
+        already printed by the executor); "New game" starts over.
+        """
+        self.thinking = False
+        self.game_over = True
+        self.status_label.config(text=f"Computer error: {error}")
+
+    def reset(self):
+        """
+        Starts a new game, cancelling any search in progress.
+        """
+        self.ai.cancel()
+        self.board = [" "] * len(self.board)
+        self.masks = {self.player_symbol: 0, self.computer_symbol: 0}
+        self.game_over = False
+        self.thinking = False
+        self.update_buttons()
+        self.status_label.config(text="Your turn (X)")
+        self.ponder()
+
+    def close(self):
+        """
+        Stops the AI worker and closes the window.
+        """
+        self.ai.shutdown()
+        self.master.destroy()
 
     def check_win(self, symbol):
         """
-        Checks if the given symbol (X or O) has won.
+        Checks if the given symbol (X or O) has won, with one mask test per line.
         """
-        win_positions = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
-            (0, 4, 8), (2, 4, 6)             # diagonals
-        ]
-        for a, b, c in win_positions:
-            if self.board[a] == symbol and self.board[b] == symbol and self.board[c] == symbol:
-                return True
-        return False
+        return self.engine.is_win(self.masks[symbol])
 
     def check_draw(self):
         """
@@ -121,12 +155,14 @@ class TicTacToe:
         """
         Update the text of each button to reflect the current board state.
         """
-        for i in range(9):
+        for i in range(len(self.board)):
             self.buttons[i].config(text=self.board[i])
 
 def main():
+    # Optional board size and run length, e.g. "4 4 4" or "5 5 4"
+    rows, cols, k = (int(arg) for arg in sys.argv[1:4]) if len(sys.argv) > 3 else (3, 3, 3)
     root = tk.Tk()
-    app = TicTacToe(root)
+    app = TicTacToe(root, rows, cols, k)
     root.mainloop()
 
 if __name__ == "__main__":
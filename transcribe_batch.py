@@ -0,0 +1,154 @@
+# Transcription par lots de tous les enregistrements d'un dossier.
+# Les fichiers sont répartis sur un groupe de processus ; chaque transcription est mise en
+# cache sous une empreinte de l'audio décodé et des réglages du moteur, si bien qu'un fichier
+# dont l'audio est déjà transcrit (inchangé, touché, copié, renommé...) n'est pas retranscrit.
+# Un index (taille, date de modification) donne l'empreinte des fichiers inchangés sans les
+# décoder ; les autres sont décodés une fois pour l'empreinte, et une seconde fois seulement
+# s'il faut les transcrire (le décodage coûte bien moins que la reconnaissance).
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from audio_to_text import SAMPLE_RATE, WORKERS, make_backend, pcm_stream, transcribe
+
+EXTENSIONS = ('.m4a', '.mp3', '.wav', '.ogg', '.flac')
+CACHE_DIR = '.transcripts'
+INDEX_FILE = 'index.json'
+
+def find_audio(directory, extensions=EXTENSIONS):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(extensions):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def audio_digest(path, sample_rate=SAMPLE_RATE):
+    # Empreinte SHA-256 du PCM décodé (indépendante du conteneur et des métadonnées) et durée
+    h = hashlib.sha256()
+    rate, blocks = pcm_stream(path, sample_rate)
+    size = 0
+    for block in blocks:
+        h.update(block)
+        size += len(block)
+    return h.hexdigest(), size / (2 * rate)
+
+def cache_key(digest, settings):
+    return hashlib.sha256((digest + json.dumps(settings, sort_keys=True)).encode()).hexdigest()
+
+def process_file(path, settings, cache_dir, known=None, chunk_workers=WORKERS):
+    # Exécuté dans un processus du groupe ; renvoie une ligne du rapport
+    start = time.perf_counter()
+    result = {'path': path, 'cached': False, 'error': None}
+    try:
+        stat = os.stat(path)
+        result['stat'] = [stat.st_size, stat.st_mtime_ns]
+        if known is not None and known['stat'] == result['stat']:
+            digest, seconds = known['digest'], known['audio_seconds']  # Inchangé : rien à décoder
+        else:
+            digest, seconds = audio_digest(path, settings['sample_rate'])
+        result.update(digest=digest, audio_seconds=seconds)
+        cache_path = os.path.join(cache_dir, cache_key(digest, settings) + '.json')
+        if os.path.exists(cache_path):
+            result['cached'] = True
+        else:
+            options = {'language': settings['language']} if settings['language'] else {}
+            backend = make_backend(settings['backend'], **options)
+            segments = list(transcribe(path, backend, chunk_workers, settings['sample_rate']))
+            failed = [s for s in segments if s.error]
+            if failed:
+                # Pas de mise en cache : les morceaux en échec seront retentés au prochain passage
+                raise RuntimeError(f"{len(failed)} morceau(x) sur {len(segments)} non transcrit(s) : {failed[0].error}")
+            segments = [{'start': s.start, 'end': s.end, 'text': s.text} for s in segments]
+            tmp_path = cache_path + f'.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'path': path, 'settings': settings, 'segments': segments}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        result['transcript'] = cache_path
+    except Exception as e:
+        result['error'] = str(e)
+    result['wall_seconds'] = time.perf_counter() - start
+    # Débit (secondes d'audio par seconde réelle) des seuls fichiers réellement transcrits
+    transcribed = not result['cached'] and result['error'] is None
+    result['speed'] = (result['audio_seconds'] / result['wall_seconds']
+                       if transcribed and result['wall_seconds'] else None)
+    return result
+
+def load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def run_batch(directory, settings, cache_dir=CACHE_DIR, workers=None, chunk_workers=WORKERS):
+    os.makedirs(cache_dir, exist_ok=True)
+    index = load_index(cache_dir)
+    paths = find_audio(directory)
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_file, path, settings, cache_dir, index.get(os.path.abspath(path)), chunk_workers)
+                   for path in paths]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if result['error']:
+                status = f"erreur : {result['error']}"
+            elif result['cached']:
+                status = f"{result['audio_seconds']:.1f} s d'audio [cache]"
+            else:
+                status = (f"{result['audio_seconds']:.1f} s d'audio en {result['wall_seconds']:.1f} s "
+                          f"(x{result['speed']:.1f})")
+            if result['error'] is None:
+                index[os.path.abspath(result['path'])] = {
+                    'stat': result['stat'], 'digest': result['digest'], 'audio_seconds': result['audio_seconds']}
+            print(f"[{done}/{len(paths)}] {result['path']} : {status}")
+
+    with open(os.path.join(cache_dir, INDEX_FILE), 'w') as f:
+        json.dump(index, f)
+    wall = time.perf_counter() - start
+    # Le débit ne compte que l'audio réellement transcrit : les fichiers en cache, servis en
+    # quelques millisecondes, le gonfleraient artificiellement
+    transcribed = [r for r in results if r['speed'] is not None]
+    audio = sum(r['audio_seconds'] for r in transcribed)
+    return {
+        'directory': directory,
+        'settings': settings,
+        'files': len(results),
+        'transcribed': len(transcribed),
+        'cached': sum(r['cached'] for r in results),
+        'errors': sum(r['error'] is not None for r in results),
+        'audio_seconds': audio,
+        'cached_audio_seconds': sum(r['audio_seconds'] for r in results if r['cached']),
+        'wall_seconds': wall,
+        'speed': audio / wall if wall else 0.0,  # Secondes d'audio transcrites par seconde réelle
+        'results': sorted(results, key=lambda r: r['path']),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcrit tous les enregistrements d'un dossier")
+    parser.add_argument('directory')
+    parser.add_argument('--backend', default='google', help="moteur : google, sphinx ou stub")
+    parser.add_argument('--language', default='en-US')
+    parser.add_argument('--workers', type=int, default=None, help='processus (défaut : un par cœur)')
+    parser.add_argument('--chunk-workers', type=int, default=WORKERS, help='morceaux transcrits en parallèle par fichier')
+    parser.add_argument('--sample-rate', type=int, default=SAMPLE_RATE)
+    parser.add_argument('--cache', default=CACHE_DIR, help='dossier du cache des transcriptions')
+    parser.add_argument('--report', default='transcription_report.json')
+    args = parser.parse_args()
+
+    settings = {'backend': args.backend, 'language': None if args.backend == 'stub' else args.language,
+                'sample_rate': args.sample_rate}
+    report = run_batch(args.directory, settings, args.cache, args.workers, args.chunk_workers)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
+    print(f"{report['files']} fichiers ({report['transcribed']} transcrits, {report['cached']} en cache, "
+          f"{report['errors']} erreurs), {report['audio_seconds']:.0f} s d'audio transcrites "
+          f"en {report['wall_seconds']:.1f} s (x{report['speed']:.1f})")
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,158 @@
+import csv
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
 
-def scrape_wikipedia(query):
-    url = f"https://en.wikipedia.org/w/index.php?search={query}"
-
+# Analyseurs rapides facultatifs : utilisés s'ils sont installés
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Cherche les titres et les résumés des résultats de recherche
-            titles = soup.find_all('div', class_='mw-search-result-heading')
-            summaries = soup.find_all('div', class_='searchresult')
+        from selectolax.parser import HTMLParser  # selectolax < 1.0
+    except ImportError:
+        HTMLParser = None
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from scrape_cache import normalize
+
+SEARCH_URL = "https://en.wikipedia.org/w/index.php"
+TIMEOUT = 10  # Secondes (connexion et lecture)
+WORKERS = 8  # Requêtes simultanées au maximum
+RATE = 5.0  # Requêtes par seconde et par hôte
+RETRIES = 3
+BACKOFF = 0.5  # Attente entre deux essais : 0.5 s, 1 s, 2 s...
+COLUMNS = ['Title', 'Summary']
+PARSERS = ('soup', 'strainer', 'lxml', 'selectolax')
+
+# Lien "page suivante" des résultats de recherche
+NEXT_LINK = re.compile(r'<a\b[^>]*\bclass="mw-nextlink"[^>]*>')
+HREF = re.compile(r'\bhref="([^"]*)"')
+# Conteneur d'un résultat : Wikipédia ajoute d'autres classes ("mw-search-result mw-search-result-ns-0")
+# et SoupStrainer compare alors la chaîne entière de l'attribut class
+RESULT_CLASS = re.compile(r'(?:^|\s)mw-search-result(?:\s|$)')
+
+def make_session(pool_size=WORKERS, retries=RETRIES, backoff=BACKOFF):
+    # Session partagée : connexions TCP/TLS réutilisées, nouvel essai avec attente
+    # croissante sur les erreurs réseau, 429 et 5xx (en respectant Retry-After)
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=('GET',), respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class RateLimiter:
+    # Espace les requêtes vers un même hôte d'au moins 1 / rate secondes, entre tous les threads
+    def __init__(self, rate=RATE):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def available_parsers():
+    return [name for name, module in zip(PARSERS, (True, True, lxml, HTMLParser)) if module is not None]
+
+def default_parser():
+    if HTMLParser is not None:
+        return 'selectolax'
+    return 'lxml' if lxml is not None else 'strainer'
+
+def parse_rows(html, parser=None):
+    # Liste de (titre, résumé), un par résultat de recherche. Chaque titre est associé au
+    # résumé de son propre conteneur <li class="mw-search-result"> : un résumé absent
+    # donne une chaîne vide au lieu de décaler toutes les lignes suivantes.
+    parser = parser or default_parser()
+    if parser == 'selectolax':
+        rows = []
+        for item in HTMLParser(html).css('li.mw-search-result'):
+            title = item.css_first('div.mw-search-result-heading')
+            summary = item.css_first('div.searchresult')
+            rows.append((title.text().strip() if title else '', summary.text().strip() if summary else ''))
+        return rows
+    if parser == 'lxml':
+        rows = []
+        for item in lxml.html.fromstring(html).find_class('mw-search-result'):
+            title = item.find_class('mw-search-result-heading')
+            summary = item.find_class('searchresult')
+            rows.append((title[0].text_content().strip() if title else '',
+                         summary[0].text_content().strip() if summary else ''))
+        return rows
+    if parser == 'strainer':
+        # Seuls les conteneurs de résultats sont construits en arbre
+        only_results = SoupStrainer('li', class_=RESULT_CLASS)
+        soup = BeautifulSoup(html, 'lxml' if lxml is not None else 'html.parser', parse_only=only_results)
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    # Cherche les titres et les résumés des résultats de recherche
+    for item in soup.find_all('li', class_='mw-search-result'):
+        title = item.find('div', class_='mw-search-result-heading')
+        summary = item.find('div', class_='searchresult')
+        rows.append((title.get_text().strip() if title else '', summary.get_text().strip() if summary else ''))
+    return rows
 
-            results = pd.DataFrame({
-                'Title': [title.get_text().strip() for title in titles],
-                'Summary': [summary.get_text().strip() for summary in summaries]
-            })
+def parse_results(html, parser=None):
+    return pd.DataFrame(parse_rows(html, parser), columns=COLUMNS)
 
+def next_page(html, url):
+    # URL absolue de la page de résultats suivante, ou None
+    link = NEXT_LINK.search(html)
+    href = HREF.search(link.group(0)) if link else None
+    return urljoin(url, href.group(1).replace('&amp;', '&')) if href else None
+
+def scrape_wikipedia(query, session=None, timeout=TIMEOUT, url=SEARCH_URL, limiter=None, cache=None, parser=None):
+    # `cache` (scrape_cache.ScrapeCache) : résultats encore frais servis sans réseau,
+    # résultats périmés revalidés par ETag / If-Modified-Since
+    try:
+        entry = None
+        headers = {}
+        if cache is not None:
+            entry = cache.get(normalize(query, url))
+            if entry is not None and entry.is_fresh(cache.ttl):
+                cache.count('hits', entry.raw_size)
+                return pd.DataFrame(entry.rows, columns=COLUMNS)
+            if entry is not None:
+                headers = entry.conditional_headers()
+        if limiter is not None:
+            limiter.wait(url)
+        response = (session or requests).get(url, params={'search': query}, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            # Page inchangée : on garde les lignes déjà extraites
+            cache.refresh(entry, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            cache.count('revalidated', entry.raw_size)
+            return pd.DataFrame(entry.rows, columns=COLUMNS)
+        if response.status_code == 200:
+            results = parse_results(response.text, parser)
+            if cache is not None:
+                cache.count('misses')
+                cache.put(normalize(query, url), response.text, results.values.tolist(),
+                          response.headers.get('ETag'), response.headers.get('Last-Modified'))
             return results
+        if entry is not None and response.status_code >= 500:
+            # Serveur indisponible pendant la revalidation : les lignes périmées valent mieux que rien
+            print("Erreur de réponse HTTP :", response.status_code, "(résultats en cache servis)")
+            cache.count('stale')
+            return pd.DataFrame(entry.rows, columns=COLUMNS)
         else:
             print("Erreur de réponse HTTP :", response.status_code)
             return pd.DataFrame()
@@ -26,7 +160,84 @@ def scrape_wikipedia(query):
         print("Une erreur s'est produite :", e)
         return pd.DataFrame()
 
-# Exemple d'utilisation
-query = "Python Programming"
-results = scrape_wikipedia(query)
-print(results.head())
\ No newline at end of file
+def scrape_many(queries, workers=WORKERS, rate=RATE, timeout=TIMEOUT, retries=RETRIES,
+                backoff=BACKOFF, url=SEARCH_URL, session=None, cache=None):
+    # Générateur de (requête, résultats) dans l'ordre où les réponses arrivent.
+    # Au plus `workers` requêtes sont en cours ; les requêtes sont lues au fur et à mesure,
+    # donc `queries` peut être un itérateur de plusieurs dizaines de milliers d'éléments.
+    session = session or make_session(workers, retries, backoff)
+    limiter = RateLimiter(rate)
+    queries = iter(queries)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        def submit_next():
+            for query in queries:
+                running[pool.submit(scrape_wikipedia, query, session, timeout, url, limiter, cache)] = query
+                return True
+            return False
+
+        for _ in range(workers):
+            if not submit_next():
+                break
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), future.result()
+                submit_next()
+
+def scrape_pages(query, session=None, timeout=TIMEOUT, url=SEARCH_URL, max_pages=None, parser=None, limiter=None):
+    # Générateur de lots de lignes (un DataFrame par page), en suivant le lien "suivant"
+    # jusqu'à `max_pages` pages : une seule page est en mémoire à la fois
+    session = session or make_session(1)
+    params = {'search': query}
+    pages = 0
+    while url and (max_pages is None or pages < max_pages):
+        if limiter is not None:
+            limiter.wait(url)
+        response = session.get(url, params=params, timeout=timeout)
+        if response.status_code != 200:
+            print("Erreur de réponse HTTP :", response.status_code)
+            return
+        yield parse_results(response.text, parser)
+        pages += 1
+        url, params = next_page(response.text, response.url), None
+
+def write_rows(batches, path):
+    # Écrit les lots au fur et à mesure : CSV, ou Parquet (pyarrow) si le chemin finit par .parquet
+    count = 0
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for batch in batches:
+                table = pa.Table.from_pandas(batch.astype(str), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                count += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for batch in batches:
+            writer.writerows(batch.itertuples(index=False))
+            count += len(batch)
+    return count
+
+if __name__ == '__main__':
+    # Exemple d'utilisation
+    query = "Python Programming"
+    results = scrape_wikipedia(query)
+    print(results.head())
+
+    # Plusieurs requêtes en parallèle, affichées dès qu'elles arrivent
+    for query, results in scrape_many(["Python Programming", "Pandas (software)", "Beautiful Soup"]):
+        print(query, ":", len(results), "résultats")
+
+    # Toutes les pages d'une recherche, écrites page par page dans un CSV
+    print(write_rows(scrape_pages("Python Programming", max_pages=3), "python_programming.csv"), "lignes écrites")